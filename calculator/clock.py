@@ -36,37 +36,86 @@ def process_clock_csv(
         missing = [col for col in required_cols if col not in df.columns]
         raise KeyError(f"Missing required columns: {missing}. Found: {list(df.columns)}")
 
-    df_shifts = df[required_cols].copy()
-
-    # Drop rows where Employee Name or Date is missing
-    df_shifts.dropna(subset=[employee_col, date_col], inplace=True)
-
-    # Convert hours to numeric, coerce errors to NaN, then drop NaN rows
-    df_shifts[hours_col] = pd.to_numeric(df_shifts[hours_col], errors="coerce")
-    df_shifts.dropna(subset=[hours_col], inplace=True)
-
-    # Convert date column to datetime
-    if date_format:
-        # Use a pivot year of 2024 to ensure 2-digit years like '25' are interpreted as 2025+
-        df_shifts[date_col] = pd.to_datetime(
-            df_shifts[date_col], 
-            format=date_format, 
-            errors="coerce",
-            utc=False
-        )
-    else:
-        df_shifts[date_col] = pd.to_datetime(df_shifts[date_col], errors="coerce")
+    # Convert hours to numeric, coercing errors to NaN
+    hours = pd.to_numeric(df[hours_col], errors="coerce")
+
+    # Convert date column to datetime. Timesheets repeat the same few dates many
+    # times, so only the distinct values are parsed and then mapped back by code
+    # (missing dates get code -1 and come back as NaT).
+    # With a date_format, use a pivot year of 2024 to ensure 2-digit years like '25' are interpreted as 2025+
+    codes, uniques = pd.factorize(df[date_col])
+    parsed = pd.to_datetime(uniques, format=date_format or None, errors="coerce", utc=False)
+    dates = pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=df.index)
 
-    # Drop rows where date conversion failed
-    df_shifts.dropna(subset=[date_col], inplace=True)
+    # Keep rows with an employee name, valid hours and a parseable date, selecting
+    # them in one pass instead of a dropna per column
+    valid = df[employee_col].notna() & hours.notna() & dates.notna()
+    df_shifts = pd.DataFrame({
+        employee_col: df.loc[valid, employee_col],
+        date_col: dates[valid],
+        hours_col: hours[valid],
+    })
 
-    # Group by employee and date, sum the hours
-    daily_hours = df_shifts.groupby([employee_col, date_col])[hours_col].sum().reset_index()
+    # Group by employee and date, sum the hours. Grouping on category codes avoids
+    # hashing every employee name string; names are restored to plain values after.
+    df_shifts[employee_col] = df_shifts[employee_col].astype("category")
+    # sort=False: the single sort_values below fixes the order, so the groupby sort is wasted work
+    daily_hours = df_shifts.groupby([employee_col, date_col], sort=False, observed=True)[hours_col].sum().reset_index()
     daily_hours.rename(columns={hours_col: "Total Daily Hours"}, inplace=True)
-    daily_hours.sort_values(by=[employee_col, date_col], inplace=True)
+    daily_hours.sort_values(by=[employee_col, date_col], inplace=True, ignore_index=True)
+    daily_hours[employee_col] = daily_hours[employee_col].astype(object)
+
+    # nunique() is a full pass, so only pay for it when the message will be emitted
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "Processed clock data: %s records from %s employees", len(daily_hours), daily_hours[employee_col].nunique()
+        )
+
+    return daily_hours
 
-    logger.info(
-        f"Processed clock data: {len(daily_hours)} records from {daily_hours[employee_col].nunique()} employees"
+
+def process_clock_csv_path(
+    path: str,
+    employee_col: str = "Employee Name",
+    date_col: str = "Clock In Date",
+    hours_col: str = "Elapsed Hours",
+    date_format: Optional[str] = "%d-%b-%y",
+    chunksize: int = 500_000,
+    **read_csv_kwargs,
+) -> pd.DataFrame:
+    """Stream a clock/timesheet CSV from disk and aggregate hours like `process_clock_csv`.
+
+    Only the three required columns are read, `chunksize` rows at a time, and each
+    chunk is reduced to per (employee, date) totals before the next one is read, so
+    memory is bounded by the chunk size plus the number of distinct employee/date pairs.
+
+    Args:
+        path: Path to the CSV file
+        employee_col, date_col, hours_col, date_format: As for `process_clock_csv`
+        chunksize: Number of rows to read per chunk
+        **read_csv_kwargs: Extra arguments for `pd.read_csv` (e.g. skiprows=1 to skip a title row)
+
+    Returns:
+        DataFrame with columns [employee_col, date_col, 'Total Daily Hours']
+        sorted by employee and date.
+
+    Raises:
+        ValueError: If required columns are missing from the file
+    """
+    totals = None
+    reader = pd.read_csv(
+        path, usecols=[employee_col, date_col, hours_col], chunksize=chunksize, **read_csv_kwargs
     )
+    with reader:
+        for chunk in reader:
+            partial = process_clock_csv(chunk, employee_col, date_col, hours_col, date_format)
+            partial = partial.set_index([employee_col, date_col])["Total Daily Hours"]
+            totals = partial if totals is None else totals.add(partial, fill_value=0.0)
+
+    if totals is None:
+        return pd.DataFrame(columns=[employee_col, date_col, "Total Daily Hours"])
 
+    daily_hours = totals.rename("Total Daily Hours").reset_index()
+    daily_hours.sort_values(by=[employee_col, date_col], inplace=True, ignore_index=True)
+    daily_hours[employee_col] = daily_hours[employee_col].astype(object)
     return daily_hours
@@ -2,6 +2,10 @@ from decimal import Decimal, ROUND_HALF_UP, getcontext
 
 getcontext().prec = 28
 
+# Strips currency symbols and thousands separators, and turns accounting-style
+# negatives like "(500.00)" into "-500.00", in a single str.translate pass per value
+CURRENCY_TRANSLATION = str.maketrans({"$": None, ",": None, "(": "-", ")": None})
+
 
 def _to_decimal(value) -> Decimal:
     if isinstance(value, Decimal):
@@ -9,6 +13,52 @@ def _to_decimal(value) -> Decimal:
     return Decimal(str(value))
 
 
+def _to_hundredths(value: Decimal):
+    """Return `value` * 100 as an int, or None if that is not a whole number."""
+    if not value.is_finite():
+        return None
+    scaled = value.scaleb(2)
+    if scaled != scaled.to_integral_value():
+        return None
+    return int(scaled)
+
+
+def calculate_tip_cents(amount_cents: int, percent_bp: int) -> int:
+    """Return the tip in cents for `amount_cents` at `percent_bp` basis points.
+
+    Integer-only equivalent of `calculate_tip` (1% == 100 basis points),
+    rounding half up.
+    """
+    if amount_cents < 0 or percent_bp < 0:
+        raise ValueError("amount and percent must be non-negative")
+    return (amount_cents * percent_bp + 5000) // 10000
+
+
+def calculate_tip_batch(amounts_cents, percent_bp):
+    """Vectorized `calculate_tip_cents` over an array of amounts in cents.
+
+    `percent_bp` may be a single rate or an array of per-amount rates.
+    Returns an int64 NumPy array of tips in cents.
+    """
+    import numpy as np
+
+    cents = np.asarray(amounts_cents, dtype=np.int64)
+    bp = np.asarray(percent_bp, dtype=np.int64)
+    if (bp < 0).any() or (cents < 0).any():
+        raise ValueError("amount and percent must be non-negative")
+    return (cents * bp + 5000) // 10000
+
+
+def calculate_pay_cents(hours_hundredths: int, rate_cents: int) -> int:
+    """Return gross pay in cents for hours given in hundredths at a rate in cents.
+
+    Integer-only equivalent of `calculate_pay`, rounding half up.
+    """
+    if hours_hundredths < 0 or rate_cents < 0:
+        raise ValueError("hours and rate must be non-negative")
+    return (hours_hundredths * rate_cents + 50) // 100
+
+
 def calculate_tip(amount, percent) -> Decimal:
     """Return the tip amount for `amount` at `percent` percent.
 
@@ -18,6 +68,11 @@ def calculate_tip(amount, percent) -> Decimal:
     p = _to_decimal(percent)
     if a < 0 or p < 0:
         raise ValueError("amount and percent must be non-negative")
+    # Whole cents at a percent with at most two decimals take the integer path
+    a_cents = _to_hundredths(a)
+    p_bp = _to_hundredths(p)
+    if a_cents is not None and p_bp is not None:
+        return Decimal(calculate_tip_cents(a_cents, p_bp)).scaleb(-2)
     tip = (a * p / Decimal("100"))
     return tip.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
 
@@ -34,5 +89,10 @@ def calculate_pay(hours, rate) -> Decimal:
     r = _to_decimal(rate)
     if h < 0 or r < 0:
         raise ValueError("hours and rate must be non-negative")
+    # Hours and rate with at most two decimals take the integer path
+    h_hundredths = _to_hundredths(h)
+    r_cents = _to_hundredths(r)
+    if h_hundredths is not None and r_cents is not None:
+        return Decimal(calculate_pay_cents(h_hundredths, r_cents)).scaleb(-2)
     pay = h * r
     return pay.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
@@ -1,10 +1,15 @@
 """Sales data processing to extract daily tip amounts."""
 import logging
+from importlib.util import find_spec
+import numpy as np
 import pandas as pd
 from typing import Optional
+from calculator.core import CURRENCY_TRANSLATION
 
 logger = logging.getLogger(__name__)
 
+_STRING_DTYPE = "string[pyarrow]" if find_spec("pyarrow") else "string"
+
 
 def process_sales_csv(
     df: pd.DataFrame,
@@ -35,19 +40,18 @@ def process_sales_csv(
     if sales_col_label not in df.columns:
         raise ValueError(f"Column '{sales_col_label}' not found. Available columns: {list(df.columns)}")
 
-    # Find the Tips row
-    tips_rows = df[df[sales_col_label] == tips_row_label]
-    if tips_rows.empty:
+    # Find the Tips row with one vectorized comparison over the label column
+    labels = df[sales_col_label].to_numpy(dtype=object)
+    tips_rows = np.flatnonzero(labels == tips_row_label)
+    if len(tips_rows) == 0:
         raise ValueError(f"Could not find row with '{sales_col_label}' == '{tips_row_label}'")
 
-    tips_row = tips_rows.iloc[0]
-
-    # Extract dates from the first data row
-    first_data_row = df.iloc[0]
-    dates = first_data_row.iloc[data_start_col:].tolist()
-
-    # Extract tip values from the Tips row
-    tip_values = tips_row.iloc[data_start_col:].tolist()
+    # Only the date row (the first data row) and the Tips row are needed, so just
+    # those two rows are pulled out as a NumPy grid; wide sheets never get
+    # converted to object wholesale
+    values = df.iloc[[0, tips_rows[0]], data_start_col:].to_numpy(dtype=object)
+    dates = values[0]
+    tip_values = values[1]
 
     # Create DataFrame
     daily_tips_df = pd.DataFrame({
@@ -59,18 +63,16 @@ def process_sales_csv(
     daily_tips_df["Tip Amount"] = (
         daily_tips_df["Tip Amount"]
         .astype(str)
-        .str.replace("$", "", regex=False)
-        .str.replace(",", "", regex=False)
-        .str.replace("(", "-", regex=False)
-        .str.replace(")", "", regex=False)
+        .str.translate(CURRENCY_TRANSLATION)
         .str.strip()
     )
 
     # Convert to numeric
     daily_tips_df["Tip Amount"] = pd.to_numeric(daily_tips_df["Tip Amount"], errors="coerce")
 
-    # Convert dates to strings to preserve them (don't coerce to NaN)
-    daily_tips_df["Date"] = daily_tips_df["Date"].astype(str).str.strip()
+    # Convert dates to strings to preserve them (don't coerce to NaN). Arrow-backed
+    # strings live in one contiguous buffer and strip in C; missing cells become <NA>.
+    daily_tips_df["Date"] = daily_tips_df["Date"].astype(_STRING_DTYPE).str.strip()
 
     # Remove rows where Tip Amount is NaN
     daily_tips_df.dropna(subset=["Tip Amount"], inplace=True)
@@ -90,9 +92,28 @@ def process_sales_csv(
         else:
             daily_tips_df.sort_values(by="Date", inplace=True)
     except Exception as e:
-        logger.warning(f"Could not parse dates as datetime: {e}. Sorting as strings.")
+        logger.warning("Could not parse dates as datetime: %s. Sorting as strings.", e)
         daily_tips_df.sort_values(by="Date", inplace=True)
 
-    logger.info(f"Extracted {len(daily_tips_df)} daily tip records from sales data")
+    # The Arrow-backed dtype is internal only; hand back plain str dates as before
+    daily_tips_df["Date"] = daily_tips_df["Date"].astype(str)
+
+    logger.info("Extracted %s daily tip records from sales data", len(daily_tips_df))
 
     return daily_tips_df
+
+
+def process_sales_path(path: str, **kwargs) -> pd.DataFrame:
+    """Read a sales report CSV from `path` and extract daily tip amounts.
+
+    Uses pyarrow's multithreaded CSV reader when it is installed, otherwise
+    falls back to `pd.read_csv`. Keyword arguments are passed through to
+    `process_sales_csv`.
+    """
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        df = pd.read_csv(path)
+    else:
+        df = pacsv.read_csv(path).to_pandas()
+    return process_sales_csv(df, **kwargs)
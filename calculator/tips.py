@@ -1,14 +1,45 @@
-from typing import Dict, Optional, List, Union, Tuple
+from typing import BinaryIO, Dict, Iterable, Optional, List, Union, Tuple
 import logging
 import io
+import re
 import difflib
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+import numpy as np
 import pandas as pd
 from calculator.clock import process_clock_csv
+from calculator.core import CURRENCY_TRANSLATION
 
 logger = logging.getLogger(__name__)
 
+# Prefer the Rust-backed readers/writers when installed; None means pandas' default (openpyxl)
+EXCEL_READ_ENGINE = "calamine" if find_spec("python_calamine") else None
+EXCEL_WRITE_ENGINE = "xlsxwriter" if find_spec("xlsxwriter") else None
+CSV_READ_ENGINE = "pyarrow" if find_spec("pyarrow") else None
 
-def is_clock_file(df: pd.DataFrame, filename: str = None) -> bool:
+# Column-name keywords used by is_clock_file, one compiled alternation per check
+_CLOCK_EMPLOYEE_KW = re.compile("employee|name|staff|emp")
+_CLOCK_DATE_KW = re.compile("date|shift|clock")
+_CLOCK_HOURS_KW = re.compile("hour|hrs|elapsed|time")
+_CLOCK_TIPS_KW = re.compile("tip|gratuity")
+
+# Leading bytes of the Excel container formats: xlsx is a zip archive, xls an OLE2 file
+_EXCEL_SIGNATURES = (b"PK\x03\x04", b"\xd0\xcf\x11\xe0")
+
+# Number of top rows scanned when looking for the header row
+_HEADER_SCAN_ROWS = 15
+
+# Row labels that mark the tips row of a transposed sales report
+_TIPS_ROW_KW = re.compile("tip|total|gratuity|gratuities|distributed")
+
+
+def _lower_columns(df: pd.DataFrame) -> Dict:
+    """Map each column of `df` to its stripped, lowercased string name."""
+    return {c: str(c).strip().lower() for c in df.columns}
+
+
+def is_clock_file(df: pd.DataFrame, filename: str = None, cols_lower: Optional[Dict] = None) -> bool:
     """Heuristically determine if a DataFrame is clock/timesheet data.
     
     Clock files typically have:
@@ -17,6 +48,7 @@ def is_clock_file(df: pd.DataFrame, filename: str = None) -> bool:
     - Hours column (but NOT tips column)
     
     If filename is provided, uses it as a strong indicator (e.g., "clock" in filename).
+    cols_lower may pass a precomputed `_lower_columns(df)` map so it is not rebuilt.
     
     Returns True if likely a clock file, False otherwise.
     """
@@ -28,26 +60,91 @@ def is_clock_file(df: pd.DataFrame, filename: str = None) -> bool:
         if 'sales' in filename_lower or 'tip' in filename_lower:
             return False
     
-    # Convert column names to lowercase strings, handling non-string types
-    cols_lower = {str(c).lower() for c in df.columns}
+    # Lowercase column names, handling non-string types
+    if cols_lower is None:
+        cols_lower = _lower_columns(df)
+
+    def has_keyword(pattern):
+        return any(pattern.search(col) for col in cols_lower.values())
     
-    # Check for keywords in column names
-    has_employee = any(kw in col for col in cols_lower for kw in ['employee', 'name', 'staff', 'emp'])
-    has_date = any(kw in col for col in cols_lower for kw in ['date', 'shift', 'clock'])
-    has_hours = any(kw in col for col in cols_lower for kw in ['hour', 'hours', 'hrs', 'elapsed', 'time'])
-    has_tips = any(kw in col for col in cols_lower for kw in ['tip', 'tips', 'gratuity', 'gratuities'])
+    # Clock file: has employee, date, hours but NOT tips (stops at the first failed check)
+    return (
+        has_keyword(_CLOCK_EMPLOYEE_KW)
+        and has_keyword(_CLOCK_DATE_KW)
+        and has_keyword(_CLOCK_HOURS_KW)
+        and not has_keyword(_CLOCK_TIPS_KW)
+    )
+
+
+def _binary_io(source: Union[bytes, BinaryIO]) -> BinaryIO:
+    """Return a binary file object reading `source` from the start.
+
+    Bytes are wrapped in a BytesIO; a seekable file object (e.g. an upload
+    stream) is rewound and used directly, without copying it into memory.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+def _read_csv_bytes(source: Union[bytes, BinaryIO], **kwargs) -> pd.DataFrame:
+    """Parse CSV bytes or a binary file object, using pyarrow's multithreaded parser when it is installed.
+
+    Falls back to pandas' C parser for input the Arrow parser rejects (e.g. ragged rows).
+    """
+    if CSV_READ_ENGINE is not None:
+        try:
+            return pd.read_csv(_binary_io(source), engine=CSV_READ_ENGINE, **kwargs)
+        except ValueError as e:
+            logger.debug("%s CSV parser failed (%s), retrying with the default parser", CSV_READ_ENGINE, e)
+    return pd.read_csv(_binary_io(source), **kwargs)
+
+
+def _check_signature(source: Union[bytes, BinaryIO], ext: str) -> None:
+    """Raise ValueError if the leading bytes of `source` don't fit its extension.
+
+    A cheap sniff so corrupt or mislabelled files fail before any parsing work.
+    Either Excel signature is accepted for .xlsx/.xls, since pandas detects the
+    actual workbook format from the content.
+    """
+    head = _binary_io(source).read(1024)
+    if ext in ("xlsx", "xls"):
+        if not head.startswith(_EXCEL_SIGNATURES):
+            raise ValueError(f"File is not a valid Excel workbook (.{ext})")
+    elif b"\x00" in head:
+        raise ValueError("File is not a text CSV file")
+
+
+def _read_raw(source: Union[bytes, BinaryIO], filename: str) -> pd.DataFrame:
+    """Parse Excel or CSV bytes WITHOUT a header so every row can be examined.
+
+    `source` may also be a seekable binary file object such as an upload stream,
+    which is parsed in place instead of being read into a bytes copy first.
+    The raw frame can be handed to both `_apply_header` and
+    `_extract_from_transposed_sales_report` so an upload is only parsed once.
+
+    Raises:
+        ValueError: If file format is not supported or the content doesn't match it
+    """
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if ext in ("xlsx", "xls", "csv"):
+        _check_signature(source, ext)
     
-    # Clock file: has employee, date, hours but NOT tips
-    return has_employee and has_date and has_hours and not has_tips
+    if ext in ("xlsx", "xls"):
+        return pd.read_excel(_binary_io(source), header=None, engine=EXCEL_READ_ENGINE)
+    elif ext == "csv":
+        return _read_csv_bytes(source, header=None)
+    raise ValueError(f"Unsupported file format: {ext}. Supported: xlsx, xls, csv")
 
 
-def read_file_to_df(file_bytes: bytes, filename: str) -> pd.DataFrame:
-    """Read Excel or CSV file from bytes and return DataFrame.
+def read_file_to_df(file_bytes: Union[bytes, BinaryIO], filename: str) -> pd.DataFrame:
+    """Read Excel or CSV file from bytes or a binary file object and return DataFrame.
     
     Attempts to detect and skip report headers and multi-row headers.
     
     Args:
-        file_bytes: Raw file content
+        file_bytes: Raw file content, or a seekable binary file object
         filename: Original filename (used to infer format)
     
     Returns:
@@ -56,45 +153,45 @@ def read_file_to_df(file_bytes: bytes, filename: str) -> pd.DataFrame:
     Raises:
         ValueError: If file format is not supported
     """
-    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-    
-    # Read WITHOUT header first so we can examine all rows
-    if ext in ("xlsx", "xls"):
-        df = pd.read_excel(io.BytesIO(file_bytes), header=None)
-    elif ext == "csv":
-        df = pd.read_csv(io.BytesIO(file_bytes), header=None)
-    else:
-        raise ValueError(f"Unsupported file format: {ext}. Supported: xlsx, xls, csv")
-    
-    # Now find the actual header row by scanning from top
+    return _apply_header(_read_raw(file_bytes, filename))
+
+
+def _find_header_row(df: pd.DataFrame) -> int:
+    """Return the position of the header row among the top rows of a raw frame."""
+    # Scan the top rows, all at once
     header_idx = 0
     if len(df) > 1:
-        for idx in range(min(15, len(df))):
-            row = df.iloc[idx]
-            row_str = ' '.join(str(c).lower() for c in row)
-            
-            # Skip rows that are clearly not headers:
-            # - Row is mostly NaN/empty
-            # - Row contains "report" or "sales" (report title rows)
-            non_empty = sum(1 for v in row if not pd.isna(v) and str(v).strip() != "")
-            has_report_keyword = any(kw in row_str for kw in ['report', 'sales', 'summary', 'total'])
-            
-            if non_empty < len(df.columns) * 0.4:  # Less than 40% filled
-                continue
-            if has_report_keyword and non_empty < len(df.columns) * 0.7:  # Report line but sparse
-                continue
-                
+        head = df.iloc[:_HEADER_SCAN_ROWS]
+        text = head.astype(str).apply(lambda col: col.str.strip().str.lower())
+
+        # Skip rows that are clearly not headers:
+        # - Row is mostly NaN/empty
+        # - Row contains "report" or "sales" (report title rows)
+        non_empty = (head.notna() & (text != "")).sum(axis=1)
+        has_report_keyword = text.apply(
+            lambda col: col.str.contains("report|sales|summary|total", regex=True, na=False)
+        ).any(axis=1)
+
+        is_header = (non_empty >= len(df.columns) * 0.4) & ~(  # At least 40% filled
+            has_report_keyword & (non_empty < len(df.columns) * 0.7)  # Report line but sparse
+        )
+        if is_header.any():
             # This looks like a header row
-            header_idx = idx
-            logger.info(f"Found header at row {idx}: {list(row)[:5]}...")
-            break
-    
+            header_idx = int(np.argmax(is_header.to_numpy()))
+            logger.info("Found header at row %s: %s...", header_idx, list(df.iloc[header_idx])[:5])
+    return header_idx
+
+
+def _apply_header(df: pd.DataFrame) -> pd.DataFrame:
+    """Find the header row in a raw (header-less) frame and return the data below it."""
+    header_idx = _find_header_row(df)
+
     # Apply the header
     header_row = [str(x).strip() for x in df.iloc[header_idx]]
     df = df.iloc[header_idx + 1:].reset_index(drop=True)
     df.columns = header_row
     
-    logger.info(f"Applied header from row {header_idx}. Columns: {list(df.columns)}")
+    logger.info("Applied header from row %s. Columns: %s", header_idx, list(df.columns))
     
     return df
 
@@ -104,76 +201,64 @@ def _is_transposed_sales_report(df: pd.DataFrame) -> bool:
     if len(df) < 2:
         return False
     # Check for a 'Tips' row indicator (usually in first column)
-    first_col = df.iloc[:, 0] if len(df.columns) > 0 else None
-    if first_col is None:
+    if len(df.columns) == 0:
         return False
-    has_tips_row = any('tip' in str(v).lower() for v in first_col)
-    return has_tips_row
+    return bool(df.iloc[:, 0].astype(str).str.contains('tip', case=False, regex=False, na=False).any())
 
 
-def _extract_from_transposed_sales_report(file_bytes: bytes, filename: str) -> Optional[pd.DataFrame]:
+def _extract_from_transposed_sales_report(df_raw: pd.DataFrame) -> Optional[pd.DataFrame]:
     """
     Extract daily tips from a transposed sales report format where:
     - Dates are in a header row (typically around row 9)
     - Tips values are in a 'Tips' labeled row
     - Each column represents a day
     
+    Takes the raw header-less frame from `_read_raw`.
     Returns a DataFrame with 'Date' and 'Tip Amount' columns, or None if not this format.
     """
-    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-    
     try:
-        # Try reading with no header first to find the date row
-        if ext in ("xlsx", "xls"):
-            df_raw = pd.read_excel(io.BytesIO(file_bytes), header=None)
-        elif ext == "csv":
-            df_raw = pd.read_csv(io.BytesIO(file_bytes), header=None)
-        else:
-            return None
-        
         # Look for a row that contains dates (typically has many date-like values)
         # Focus on rows with date patterns like "28-Jun", "29-Jun", etc.
+        # Score the top rows in one pass, skipping the first column (usually row label)
+        block = df_raw.iloc[:15, 1:]
+        text = block.astype(str).apply(lambda col: col.str.strip())
+        present = block.notna() & (text != "")
+
+        # Check for short date format (e.g., "28-Jun", "1-Jul")
+        is_short_date = present & text.apply(
+            lambda col: (col.str.len() <= 10)
+            & col.str.contains("-", regex=False, na=False)
+            & col.str.contains(r"[^\W\d_]", regex=True, na=False)
+        )
+        short_date_count = is_short_date.sum(axis=1).to_numpy()
+
+        # Try to parse every present cell as a date with a single call
+        parsed = pd.to_datetime(text.where(present).stack(), format="mixed", errors="coerce")
+        date_count = parsed.notna().groupby(level=0).sum().reindex(block.index, fill_value=0).to_numpy()
+
+        # Prefer short date formats, but accept if majority can be parsed as dates
+        threshold = block.shape[1] * 0.8
+        is_short_date_row = short_date_count >= threshold  # 80% short date format
+        is_date_row = (date_count >= threshold) & (np.arange(len(block)) > 2)  # Avoid early rows with mixed text
+
         date_row_idx = None
-        for idx in range(min(15, len(df_raw))):
-            row = df_raw.iloc[idx]
-            # Try to parse values as dates, but prefer short date formats like "28-Jun"
-            date_count = 0
-            short_date_count = 0
-            for val in row[1:]:  # Skip first column (usually row label)
-                val_str = str(val).strip()
-                if not val_str or pd.isna(val):
-                    continue
-                # Check for short date format (e.g., "28-Jun", "1-Jul")
-                if len(val_str) <= 10 and '-' in val_str and any(c.isalpha() for c in val_str):
-                    short_date_count += 1
-                try:
-                    pd.to_datetime(val_str)
-                    date_count += 1
-                except:
-                    pass
-            
-            # Prefer short date formats, but accept if majority can be parsed as dates
-            if short_date_count >= len(row[1:]) * 0.8:  # 80% short date format
-                date_row_idx = idx
-                logger.info(f"Found date row at index {idx} (short date format)")
-                break
-            elif date_count >= len(row[1:]) * 0.8 and idx > 2:  # Avoid early rows with mixed text
-                date_row_idx = idx
-                logger.info(f"Found date row at index {idx}")
-                break
+        candidates = np.flatnonzero(is_short_date_row | is_date_row)
+        if len(candidates) > 0:
+            date_row_idx = int(candidates[0])
+            if is_short_date_row[date_row_idx]:
+                logger.info("Found date row at index %s (short date format)", date_row_idx)
+            else:
+                logger.info("Found date row at index %s", date_row_idx)
         
         if date_row_idx is None:
             return None
         
         # Look for Tips row - check for variations like "Tips", "Total", "Gratuity", etc.
-        tips_row_idx = None
-        tip_keywords = ['tip', 'total', 'gratuity', 'gratuities', 'distributed']
-        for idx in range(len(df_raw)):
-            row_label = str(df_raw.iloc[idx, 0]).lower().strip()
-            if any(kw in row_label for kw in tip_keywords):
-                tips_row_idx = idx
-                logger.info(f"Found Tips row at index {idx} with label: {df_raw.iloc[idx, 0]}")
-                break
+        labels = df_raw.iloc[:, 0].astype(str).str.lower()
+        tips_rows = np.flatnonzero(labels.str.contains(_TIPS_ROW_KW, na=False).to_numpy())
+        tips_row_idx = int(tips_rows[0]) if len(tips_rows) > 0 else None
+        if tips_row_idx is not None:
+            logger.info("Found Tips row at index %s with label: %s", tips_row_idx, df_raw.iloc[tips_row_idx, 0])
         
         if tips_row_idx is None:
             logger.debug("No Tips row found - not a transposed sales report")
@@ -183,7 +268,7 @@ def _extract_from_transposed_sales_report(file_bytes: bytes, filename: str) -> O
         dates = df_raw.iloc[date_row_idx, 1:].tolist()
         tip_values = df_raw.iloc[tips_row_idx, 1:].tolist()
         
-        logger.debug(f"Extracted {len(dates)} dates and {len(tip_values)} tip values")
+        logger.debug("Extracted %s dates and %s tip values", len(dates), len(tip_values))
         
         # Create DataFrame with a placeholder employee name since transposed format doesn't have employee info
         daily_tips_df = pd.DataFrame({
@@ -193,27 +278,23 @@ def _extract_from_transposed_sales_report(file_bytes: bytes, filename: str) -> O
             'Tips': tip_values
         })
         
-        logger.debug(f"Created DataFrame with {len(daily_tips_df)} rows")
+        logger.debug("Created DataFrame with %s rows", len(daily_tips_df))
         
         # Clean Tips column
         daily_tips_df['Tips'] = (
             daily_tips_df['Tips']
             .astype(str)
-            .str.replace('$', '', regex=False)
-            .str.replace(',', '', regex=False)
-            .str.replace('(', '-', regex=False)
-            .str.replace(')', '', regex=False)
+            .str.translate(CURRENCY_TRANSLATION)
             .str.strip()
         )
         daily_tips_df['Tips'] = pd.to_numeric(daily_tips_df['Tips'], errors='coerce')
         
-        logger.debug(f"After tip column cleaning, {daily_tips_df['Tips'].notna().sum()} non-NaN tips")
+        logger.debug("After tip column cleaning, %s non-NaN tips", daily_tips_df['Tips'].notna().sum())
         
         # Convert dates - try multiple formats since the file might have dates like "28-Jun" without year
-        logger.debug(f"Sample dates before conversion: {daily_tips_df['Date'].head(3).tolist()}")
+        logger.debug("Sample dates before conversion: %s", daily_tips_df['Date'].head(3).tolist())
         
         # Detect year from the entire raw dataframe (including headers)
-        import re
         from datetime import datetime
         
         detected_year = None
@@ -227,7 +308,7 @@ def _extract_from_transposed_sales_report(file_bytes: bytes, filename: str) -> O
                 year_match = re.search(r'\b(20[0-9]{2})\b', cell_str)
                 if year_match:
                     detected_year = year_match.group(1)
-                    logger.info(f"Detected year {detected_year} from file: {cell_str}")
+                    logger.info("Detected year %s from file: %s", detected_year, cell_str)
                     break
             if detected_year:
                 break
@@ -247,13 +328,13 @@ def _extract_from_transposed_sales_report(file_bytes: bytes, filename: str) -> O
                         detected_year = f"20{two_digit}"
                     else:
                         detected_year = f"19{two_digit}"
-                    logger.info(f"Inferred year {detected_year} from 2-digit year: {sample_str}")
+                    logger.info("Inferred year %s from 2-digit year: %s", detected_year, sample_str)
                     break
         
         # If still no year found, use current year
         if not detected_year:
             detected_year = str(datetime.now().year)
-            logger.info(f"No year found in file, using current year: {detected_year}")
+            logger.info("No year found in file, using current year: %s", detected_year)
         
         # Convert 2-digit year to 4-digit if needed
         if len(detected_year) == 2:
@@ -261,22 +342,19 @@ def _extract_from_transposed_sales_report(file_bytes: bytes, filename: str) -> O
         
         year_suffix = detected_year[-2:]  # Get last 2 digits for the format string
         
-        # First try parsing with explicit format handling
-        def parse_date(date_str):
-            if pd.isna(date_str) or str(date_str).strip() == '':
-                return pd.NaT
-            try:
-                # Try direct parsing first
-                return pd.to_datetime(date_str)
-            except:
-                try:
-                    # If that fails, try common formats like "28-Jun" with detected year
-                    parsed = pd.to_datetime(f"{date_str}-{year_suffix}", format="%d-%b-%y")
-                    return parsed
-                except:
-                    return pd.NaT
-        
-        daily_tips_df['Date'] = daily_tips_df['Date'].apply(parse_date)
+        # Parse the whole column at once. Day-month values without a year (e.g. "28-Jun")
+        # take the detected year; the general parser would otherwise default them to year 1.
+        raw_dates = daily_tips_df['Date']
+        text = raw_dates.astype(str).str.strip().where(raw_dates.notna())
+        no_year = text.str.fullmatch(r"\d{1,2}-[A-Za-z]{3}", na=False)
+        dates = pd.to_datetime(raw_dates.where(~no_year), format="mixed", errors="coerce")
+        dates[no_year] = pd.to_datetime(text[no_year] + f"-{year_suffix}", format="%d-%b-%y", errors="coerce")
+
+        # Anything else the general parser rejected gets one more try with the detected year
+        retry = dates.isna() & text.notna() & (text != "") & ~no_year
+        if retry.any():
+            dates[retry] = pd.to_datetime(text[retry] + f"-{year_suffix}", format="%d-%b-%y", errors="coerce")
+        daily_tips_df['Date'] = dates
         
         # Handle year boundary crossings (e.g., Dec 2025 to Jan 2026)
         # If we have dates and some are in January but most are in Dec/later months,
@@ -292,20 +370,20 @@ def _extract_from_transposed_sales_report(file_bytes: bytes, filename: str) -> O
                         # Increment year for all dates that are in month <= 3
                         mask = daily_tips_df['Date'].dt.month <= 3
                         daily_tips_df.loc[mask, 'Date'] = daily_tips_df.loc[mask, 'Date'] + pd.DateOffset(years=1)
-                        logger.info(f"Detected year boundary, incremented {mask.sum()} January-March dates by 1 year")
+                        logger.info("Detected year boundary, incremented %s January-March dates by 1 year", mask.sum())
                         break
         
-        logger.debug(f"After date conversion, {daily_tips_df['Date'].notna().sum()} valid dates")
-        logger.debug(f"Sample dates after conversion: {daily_tips_df['Date'].head(3).tolist()}")
+        logger.debug("After date conversion, %s valid dates", daily_tips_df['Date'].notna().sum())
+        logger.debug("Sample dates after conversion: %s", daily_tips_df['Date'].head(3).tolist())
         
         # Remove rows with NaN dates or tips
         daily_tips_df = daily_tips_df.dropna(subset=['Date', 'Tips'])
         
-        logger.info(f"Extracted {len(daily_tips_df)} daily tips from transposed sales report")
+        logger.info("Extracted %s daily tips from transposed sales report", len(daily_tips_df))
         return daily_tips_df if len(daily_tips_df) > 0 else None
         
     except Exception as e:
-        logger.debug(f"Not a transposed sales report: {type(e).__name__}: {e}")
+        logger.debug("Not a transposed sales report: %s: %s", type(e).__name__, e)
         import traceback
         logger.debug(traceback.format_exc())
         return None
@@ -317,18 +395,68 @@ def _normalize_df(df: pd.DataFrame, date_col: str, tips_col: str, hours_col: str
         missing = [col for col in required_cols if col not in df.columns]
         raise KeyError(f"Missing required columns: {missing}")
 
-    df = df.copy()
-    df[date_col] = pd.to_datetime(df[date_col])
-    df[hours_col] = pd.to_numeric(df[hours_col], errors="coerce").fillna(0.0)
-    df[tips_col] = pd.to_numeric(df[tips_col], errors="coerce").fillna(0.0)
-    return df
+    dates = df[date_col]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, cache=True)
+    # Only the calendar day matters downstream. Flooring once here lets every later
+    # group-by and join use the column directly as a datetime64 day key.
+    dates = dates.dt.floor("D")
+
+    # Build the typed frame from just the four columns used downstream instead of
+    # deep-copying every input column first
+    return pd.DataFrame({
+        date_col: dates,
+        # Tips are carried as int64 cents from here on, so daily sums are exact;
+        # distribute_daily_tips_df converts the shares back to dollars once at the end
+        tips_col: _to_cents(_to_float_or_zero(df[tips_col])),
+        hours_col: _to_float_or_zero(df[hours_col]),
+        # Employee names repeat on every shift; category codes make the later group-bys cheap
+        name_col: df[name_col].astype("category"),
+    })
+
 
+def _to_float_or_zero(series: pd.Series) -> pd.Series:
+    """Coerce to numeric with invalid/missing values as 0.0, skipping work for clean numeric columns."""
+    if not pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors="coerce")
+    return series.fillna(0.0) if series.hasnans else series
 
-def _concat_if_needed(df_or_list: Union[pd.DataFrame, List[pd.DataFrame]]) -> pd.DataFrame:
-    if isinstance(df_or_list, list):
-        # concat and ignore index
-        return pd.concat(df_or_list, ignore_index=True)
-    return df_or_list
+
+def _to_cents(series: pd.Series) -> pd.Series:
+    """Convert dollar amounts to int64 cents, rounding half away from zero like ROUND_HALF_UP.
+
+    Raises:
+        ValueError: If any amount is infinite or NaN
+    """
+    dollars = series.to_numpy(dtype="float64")
+    if not np.isfinite(dollars).all():
+        raise ValueError(f"Tip amounts must be finite numbers (column {series.name!r})")
+    # Drop float noise first (0.285 * 100 == 28.499999999999996) so halves round up
+    scaled = np.round(np.abs(dollars) * 100, 6)
+    return pd.Series((np.sign(dollars) * np.floor(scaled + 0.5)).astype(np.int64), index=series.index)
+
+
+def _concat_if_needed(df_or_list: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> pd.DataFrame:
+    if isinstance(df_or_list, pd.DataFrame):
+        return df_or_list
+    # concat a list or any iterable of frames and ignore index
+    return pd.concat(df_or_list, ignore_index=True)
+
+
+def _closest_match(keyword: str, candidates: List[str]) -> Optional[str]:
+    """Return the candidate most similar to `keyword` (similarity >= 0.6), or None.
+
+    Uses rapidfuzz when installed, otherwise difflib.
+    """
+    if not candidates:
+        return None
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        matches = difflib.get_close_matches(keyword, candidates, n=1, cutoff=0.6)
+        return matches[0] if matches else None
+    match = process.extractOne(keyword, candidates, scorer=fuzz.ratio, score_cutoff=60)
+    return match[0] if match else None
 
 
 def _detect_columns(df: pd.DataFrame) -> Tuple[str, str, str, str]:
@@ -372,54 +500,178 @@ def _detect_columns(df: pd.DataFrame) -> Tuple[str, str, str, str]:
             except Exception:
                 continue
 
-    missing = [n for n, v in (
-        ("date_col", date_col),
-        ("tips_col", tips_col),
-        ("hours_col", hours_col),
-        ("name_col", name_col),
-    ) if v is None]
+    found = {"date_col": date_col, "tips_col": tips_col, "hours_col": hours_col, "name_col": name_col}
 
-    # If still missing, try fuzzy matching against column names
-    if missing:
-        lowered_values = list(lowered.values())
+    # If still missing, try fuzzy matching against the column names not already taken
+    if None in found.values():
+        taken = set(found.values())
         for key, kw_list in [("date_col", date_kw), ("tips_col", tips_kw), ("hours_col", hours_kw), ("name_col", name_kw)]:
             # only try for ones that are still missing
-            if locals().get(key) is not None:
+            if found[key] is not None:
                 continue
+            candidates = {low: orig for orig, low in lowered.items() if orig not in taken}
             for kw in kw_list:
-                # find closest matching column lower-cased
-                matches = difflib.get_close_matches(kw, lowered_values, n=1, cutoff=0.6)
-                if matches:
-                    # find original column name that matches the lowered match
-                    low_match = matches[0]
-                    for orig, low in lowered.items():
-                        if low == low_match:
-                            locals()[key] = orig
-                            break
-                if locals().get(key) is not None:
+                low_match = _closest_match(kw, list(candidates))
+                if low_match is not None:
+                    found[key] = candidates[low_match]
+                    taken.add(found[key])
                     break
+        date_col, tips_col, hours_col, name_col = (
+            found["date_col"], found["tips_col"], found["hours_col"], found["name_col"]
+        )
 
-    missing = [n for n, v in (
-        ("date_col", date_col),
-        ("tips_col", tips_col),
-        ("hours_col", hours_col),
-        ("name_col", name_col),
-    ) if v is None]
+    missing = [n for n, v in found.items() if v is None]
 
     if missing:
         raise KeyError(f"Could not auto-detect required columns, missing: {missing}. Columns found: {cols}")
 
     # Log the detected columns
     logger.info(
-        f"Auto-detected columns: date_col={date_col}, tips_col={tips_col}, "
-        f"hours_col={hours_col}, name_col={name_col} from columns: {cols}"
+        "Auto-detected columns: date_col=%s, tips_col=%s, hours_col=%s, name_col=%s from columns: %s",
+        date_col, tips_col, hours_col, name_col, cols,
     )
 
     return date_col, tips_col, hours_col, name_col
 
 
+def _aggregate_shares(df: pd.DataFrame, date_col: str, tips_col: str, hours_col: str, name_col: str) -> pd.DataFrame:
+    """Split each day's tips by hours worked and total them per employee.
+
+    Expects `date_col` already floored to the day, as done by `_normalize_df`.
+    Returns a DataFrame indexed by employee name (sorted) with the summed
+    hours in `hours_col` and the summed tip share, in the units of `tips_col`
+    (cents after `_normalize_df`), in a 'share' column.
+    """
+    all_hours = df[hours_col].to_numpy(dtype="float64")
+    all_tips = df[tips_col].to_numpy(dtype="float64")
+
+    # Pre-aggregate one total per day; missing dates get code -1
+    day_codes, days = pd.factorize(df[date_col])
+    dated = day_codes >= 0
+    day_hours = np.bincount(day_codes[dated], weights=all_hours[dated], minlength=len(days))
+    day_tips = np.bincount(day_codes[dated], weights=all_tips[dated], minlength=len(days))
+
+    # Days with no hours or no tips never enter the share pass, nor do rows with no
+    # hours worked. The trailing False is what code -1 (no date) looks up.
+    active_day = np.append((day_hours > 0) & (day_tips != 0), False)
+    mask = active_day[day_codes] & (all_hours > 0)
+    rows = day_codes[mask]
+    hours = all_hours[mask]
+    shares = hours / day_hours[rows] * day_tips[rows]
+
+    # Per-employee totals via bincount over factorized names (missing names get code -1).
+    # Factorize unsorted and only sort the unique names afterwards, so the row codes
+    # never need remapping.
+    codes, names = pd.factorize(df[name_col][mask], sort=False)
+    named = codes >= 0
+    order = np.argsort(np.asarray(names), kind="stable")
+    return pd.DataFrame(
+        {
+            hours_col: np.bincount(codes[named], weights=hours[named], minlength=len(names))[order],
+            "share": np.bincount(codes[named], weights=shares[named], minlength=len(names))[order],
+        },
+        index=pd.Index(np.asarray(names)[order], name=name_col),
+    )
+
+
+def _aggregate_shares_polars(df: pd.DataFrame, date_col: str, tips_col: str, hours_col: str, name_col: str) -> pd.DataFrame:
+    """Polars implementation of `_aggregate_shares`.
+
+    Raises ImportError if polars is not installed.
+    """
+    import polars as pl
+
+    day_hours = pl.col(hours_col).sum().over(date_col)
+    day_tips = pl.col(tips_col).sum().over(date_col)
+
+    totals = (
+        pl.from_pandas(df[[date_col, tips_col, hours_col, name_col]])
+        .lazy()
+        .filter(pl.col(date_col).is_not_null())
+        # Day totals include unnamed rows, as in the pandas engine; they are only
+        # dropped from the per-employee totals
+        .with_columns(day_hours.alias("_day_hours"), day_tips.alias("_day_tips"))
+        .filter(
+            pl.col(name_col).is_not_null()
+            & (pl.col("_day_hours") > 0)
+            & (pl.col("_day_tips") != 0)
+            & (pl.col(hours_col) > 0)
+        )
+        .with_columns((pl.col(hours_col) / pl.col("_day_hours") * pl.col("_day_tips")).alias("share"))
+        .group_by(name_col)
+        .agg(pl.col(hours_col).sum(), pl.col("share").sum())
+        .sort(name_col)
+        .collect()
+        .to_pandas()
+    )
+    return totals.set_index(name_col)
+
+
+@lru_cache(maxsize=None)
+def _share_kernel():
+    """Compile (once) the numba kernel used by `_aggregate_shares_numba`."""
+    from numba import njit
+
+    @njit(cache=True)
+    def kernel(day_codes, name_codes, hours, tips, n_days, n_names):
+        day_hours = np.zeros(n_days)
+        day_tips = np.zeros(n_days)
+        for i in range(len(day_codes)):
+            d = day_codes[i]
+            if d >= 0:
+                day_hours[d] += hours[i]
+                day_tips[d] += tips[i]
+
+        name_hours = np.zeros(n_names)
+        name_shares = np.zeros(n_names)
+        worked = np.zeros(n_names, dtype=np.bool_)
+        for i in range(len(day_codes)):
+            d = day_codes[i]
+            n = name_codes[i]
+            if d < 0 or n < 0 or hours[i] <= 0:
+                continue
+            if day_hours[d] <= 0 or day_tips[d] == 0:
+                continue
+            name_hours[n] += hours[i]
+            name_shares[n] += hours[i] / day_hours[d] * day_tips[d]
+            worked[n] = True
+        return name_hours, name_shares, worked
+
+    return kernel
+
+
+def _aggregate_shares_numba(df: pd.DataFrame, date_col: str, tips_col: str, hours_col: str, name_col: str) -> pd.DataFrame:
+    """Numba implementation of `_aggregate_shares`.
+
+    Raises ImportError if numba is not installed.
+    """
+    kernel = _share_kernel()
+    day_codes, days = pd.factorize(df[date_col])
+    name_codes, names = pd.factorize(df[name_col], sort=True)
+
+    name_hours, name_shares, worked = kernel(
+        day_codes,
+        name_codes,
+        df[hours_col].to_numpy(dtype="float64"),
+        df[tips_col].to_numpy(dtype="float64"),
+        len(days),
+        len(names),
+    )
+    return pd.DataFrame(
+        {hours_col: name_hours[worked], "share": name_shares[worked]},
+        index=pd.Index(np.asarray(names)[worked], name=name_col),
+    )
+
+
+_SHARE_AGGREGATORS = {
+    "pandas": _aggregate_shares,
+    "polars": _aggregate_shares_polars,
+    "numba": _aggregate_shares_numba,
+}
+
+
 def distribute_daily_tips_df(
-    df_or_list: Union[pd.DataFrame, List[pd.DataFrame]],
+    df_or_list: Union[pd.DataFrame, Iterable[pd.DataFrame]],
     date_col: Optional[str],
     tips_col: Optional[str],
     hours_col: Optional[str],
@@ -428,14 +680,24 @@ def distribute_daily_tips_df(
     clock_employee_col: Optional[str] = None,
     clock_date_col: Optional[str] = None,
     clock_hours_col: Optional[str] = None,
+    engine: str = "pandas",
+    clock_cols_lower: Optional[Dict] = None,
 ) -> (Dict[str, float], pd.DataFrame):
     """Distribute tips given a pre-loaded DataFrame, with optional clock data integration.
     
     If clock_df is provided, hours will be sourced from clock data.
     If df_or_list is None or empty, uses clock data only for tip distribution calculation.
+    engine selects the aggregation backend: "pandas" (default), "polars" or
+    "numba"; the optional backends fall back to pandas when not installed.
+    clock_cols_lower may pass a precomputed `_lower_columns(clock_df)` map
+    (e.g. the one used for `is_clock_file`) for clock column auto-detection.
 
     Returns a tuple of (final_tip_distribution_dict, export_dataframe).
     """
+    # Materialize generators once so an empty one is caught by the check below
+    if df_or_list is not None and not isinstance(df_or_list, (pd.DataFrame, list)):
+        df_or_list = list(df_or_list)
+
     # Handle case where only clock data is provided (no tips file)
     if df_or_list is None or (isinstance(df_or_list, list) and not df_or_list):
         if clock_df is None:
@@ -447,13 +709,14 @@ def distribute_daily_tips_df(
         # Detect or use provided clock columns
         if clock_employee_col is None or clock_date_col is None or clock_hours_col is None:
             # Try to auto-detect clock columns
-            cols_lower = {c.lower() for c in df.columns}
+            if clock_cols_lower is None:
+                clock_cols_lower = _lower_columns(clock_df)
             if clock_employee_col is None:
-                clock_employee_col = next((c for c in df.columns if c.lower() in ['employee', 'name', 'staff']), None)
+                clock_employee_col = next((c for c, low in clock_cols_lower.items() if low in ['employee', 'name', 'staff']), None)
             if clock_date_col is None:
-                clock_date_col = next((c for c in df.columns if c.lower() in ['date', 'shift date', 'clock in date']), None)
+                clock_date_col = next((c for c, low in clock_cols_lower.items() if low in ['date', 'shift date', 'clock in date']), None)
             if clock_hours_col is None:
-                clock_hours_col = next((c for c in df.columns if c.lower() in ['hours', 'elapsed hours', 'hrs']), None)
+                clock_hours_col = next((c for c, low in clock_cols_lower.items() if low in ['hours', 'elapsed hours', 'hrs']), None)
         
         if not all([clock_employee_col, clock_date_col, clock_hours_col]):
             raise ValueError("Could not detect required clock columns: employee, date, hours")
@@ -469,10 +732,13 @@ def distribute_daily_tips_df(
         df['Date'] = pd.to_datetime(df['Date'])
         df['Hours'] = pd.to_numeric(df['Hours'], errors='coerce').fillna(0.0)
         
-        summary = df.groupby('Employee')['Hours'].sum().reset_index()
+        # Group on category codes rather than hashing every name string
+        df['Employee'] = df['Employee'].astype('category')
+        summary = df.groupby('Employee', sort=False, observed=True)['Hours'].sum().sort_index().reset_index()
         summary.columns = ['Employee Name', 'Total Tip Share']  # Use Hours as proxy for tips
+        summary['Employee Name'] = summary['Employee Name'].astype(object)
         
-        logger.info(f"Using clock data only: {len(summary)} employees")
+        logger.info("Using clock data only: %s employees", len(summary))
         return {}, summary
     
     df = _concat_if_needed(df_or_list)
@@ -490,7 +756,9 @@ def distribute_daily_tips_df(
             # Auto-detect clock columns if not provided
             if clock_employee_col is None or clock_date_col is None or clock_hours_col is None:
                 logger.debug("Auto-detecting clock columns...")
-                cols_map = {c.lower(): c for c in clock_df.columns}
+                if clock_cols_lower is None:
+                    clock_cols_lower = _lower_columns(clock_df)
+                cols_map = {low: c for c, low in clock_cols_lower.items()}
                 
                 if clock_employee_col is None:
                     for variant in ['employee name', 'employee', 'name', 'staff']:
@@ -510,7 +778,7 @@ def distribute_daily_tips_df(
                             clock_hours_col = cols_map[variant]
                             break
                 
-                logger.debug(f"Auto-detected clock columns: employee={clock_employee_col}, date={clock_date_col}, hours={clock_hours_col}")
+                logger.debug("Auto-detected clock columns: employee=%s, date=%s, hours=%s", clock_employee_col, clock_date_col, clock_hours_col)
             
             # Process clock data to get daily hours per employee
             processed_clock = process_clock_csv(
@@ -530,115 +798,80 @@ def distribute_daily_tips_df(
             
             if is_daily_total_format:
                 # Expand daily totals across individual employees from clock data
-                logger.info(f"Detected daily total format ('{unique_names[0]}'). Expanding to individual employees from clock data.")
-                logger.debug(f"Processed clock columns: {list(processed_clock.columns)}")
-                logger.debug(f"Tips data columns: {list(df.columns)}")
+                logger.info("Detected daily total format ('%s'). Expanding to individual employees from clock data.", unique_names[0])
+                logger.debug("Processed clock columns: %s", list(processed_clock.columns))
+                logger.debug("Tips data columns: %s", list(df.columns))
                 
-                # Create expanded DataFrame with individual employees
-                expanded_rows = []
-                for _, tip_row in df.iterrows():
-                    # Safely get the date
-                    try:
-                        tip_date = pd.to_datetime(tip_row[date_col]).date()
-                    except:
-                        tip_date = tip_row[date_col]
-                        if hasattr(tip_date, 'date'):
-                            tip_date = tip_date.date()
-                    
-                    daily_tips_amount = float(tip_row[tips_col])
-                    
-                    # Get all employees who worked on this date
-                    # processed_clock has columns: [employee_col, date_col, 'Total Daily Hours']
-                    # Filter by date_col column
-                    employees_on_date = processed_clock[
-                        processed_clock[clock_date_col].dt.date == tip_date
-                    ]
-                    
-                    if len(employees_on_date) > 0:
-                        # Add one row per employee with their proportional tip share
-                        # Divide the daily tips evenly across all employees who worked that day
-                        # (actual allocation will be by hours worked in the calculation loop)
-                        num_employees = len(employees_on_date)
-                        tip_per_employee = daily_tips_amount / num_employees
-                        for _, emp_row in employees_on_date.iterrows():
-                            expanded_rows.append({
-                                date_col: tip_row[date_col],
-                                name_col: emp_row[clock_employee_col],
-                                tips_col: tip_per_employee,
-                                hours_col: emp_row["Total Daily Hours"]
-                            })
-                    else:
-                        logger.debug(f"No employees found for date {tip_date}")
+                # Pair every daily total with each employee who worked that day, joining on
+                # datetime64 day keys (floored to midnight) rather than Python date objects.
+                # processed_clock has columns: [employee_col, date_col, 'Total Daily Hours']
+                tips_by_day = pd.DataFrame({
+                    date_col: df[date_col],
+                    tips_col: df[tips_col].astype(float),
+                })
+                # Zero-tip rows add nothing to any share, so don't expand them across staff
+                tips_by_day = tips_by_day[tips_by_day[tips_col].to_numpy() != 0]
+                staff_by_day = pd.DataFrame({
+                    date_col: processed_clock[clock_date_col].dt.floor("D"),
+                    name_col: processed_clock[clock_employee_col],
+                    hours_col: processed_clock["Total Daily Hours"],
+                })
+                expanded_df = tips_by_day.merge(staff_by_day, on=date_col, how="inner", sort=False)
+
+                unmatched = ~tips_by_day[date_col].isin(staff_by_day[date_col])
+                if unmatched.any():
+                    logger.debug("No employees found for dates %s", tips_by_day.loc[unmatched, date_col].tolist())
                 
-                if expanded_rows:
-                    # Reindex the expanded DataFrame with correct column names
-                    expanded_df = pd.DataFrame(expanded_rows)
-                    # Ensure column names match the original structure
-                    df = expanded_df[[date_col, name_col, tips_col, hours_col]].copy()
-                    df[date_col] = pd.to_datetime(df[date_col])
-                    df[tips_col] = pd.to_numeric(df[tips_col], errors='coerce')
-                    df[hours_col] = pd.to_numeric(df[hours_col], errors='coerce')
-                    logger.info(f"Expanded {len(df)} tip records across {len(df[name_col].unique())} employees")
-                else:
+                if len(expanded_df) > 0:
+                    # Divide the daily tips evenly across all employees who worked that day
+                    # (actual allocation will be by hours worked in the calculation loop)
+                    staff_counts = staff_by_day[date_col].value_counts()
+                    expanded_df[tips_col] = expanded_df[tips_col] / expanded_df[date_col].map(staff_counts)
+                    df = expanded_df[[date_col, name_col, tips_col, hours_col]]
+                    logger.info("Expanded %s tip records across %s employees", len(df), df[name_col].nunique())
+                elif len(tips_by_day) > 0:
                     logger.warning("Could not expand daily tips to individual employees - no matching dates found")
+                else:
+                    logger.info("No non-zero daily tips to expand")
             else:
-                # Standard merge by date and employee name
-                # Normalize dates to .date() format for matching
-                df['_date_key'] = df[date_col].apply(lambda x: pd.to_datetime(x).date() if not pd.isna(x) else None)
-                processed_clock['_date_key'] = processed_clock["Date"]
-                
-                df = df.merge(
-                    processed_clock[['_date_key', 'Employee', 'Hours']],
-                    left_on=['_date_key', name_col],
-                    right_on=['_date_key', 'Employee'],
-                    how="left",
-                    suffixes=('', '_clock')
+                # Look up each tips row's clock hours by (day, employee) instead of merging
+                # the whole clock frame in. Clock dates are brought to midnight to match the
+                # tips day keys; summing also folds any same-day entries with different times.
+                clock_hours = processed_clock.groupby(
+                    [processed_clock[clock_date_col].dt.floor("D"), clock_employee_col],
+                    sort=False,
+                )["Total Daily Hours"].sum()
+                pos = clock_hours.index.get_indexer(
+                    pd.MultiIndex.from_arrays([df[date_col], df[name_col].astype(object)])
                 )
                 # Use clock hours if available, otherwise fall back to original hours
-                df[hours_col] = df["Hours"].fillna(df[hours_col])
-                df = df.drop(columns=['_date_key', 'Employee', 'Hours'], errors="ignore")
+                df[hours_col] = np.where(pos >= 0, clock_hours.to_numpy()[pos], df[hours_col].to_numpy())
             
-            logger.info(f"Merged clock data: {len(processed_clock)} employee-date records")
+            logger.info("Merged clock data: %s employee-date records", len(processed_clock))
         except Exception as e:
-            logger.warning(f"Could not merge clock data: {e}. Using hours from tips data.")
+            logger.warning("Could not merge clock data: %s. Using hours from tips data.", e)
             import traceback
             logger.debug(traceback.format_exc())
 
-    final_tip_distribution: Dict[str, float] = {}
-    employee_hours_worked: Dict[str, float] = {}  # Track total hours per employee
-    daily_groups = df.groupby(df[date_col].dt.date)
-
-    for date, day_data in daily_groups:
-        day_total_tips = float(day_data[tips_col].sum())
-        day_total_staff_hours = float(day_data[hours_col].sum())
-
-        if day_total_staff_hours <= 0 or day_total_tips == 0:
-            continue
-
-        for _, row in day_data.iterrows():
-            name = row[name_col]
-            employee_hours = float(row[hours_col])
-            if employee_hours <= 0:
-                continue
-            tip_share_ratio = employee_hours / day_total_staff_hours
-            employee_daily_tip = day_total_tips * tip_share_ratio
-            final_tip_distribution[name] = final_tip_distribution.get(name, 0.0) + employee_daily_tip
-            # Track hours worked for each employee
-            employee_hours_worked[name] = employee_hours_worked.get(name, 0.0) + employee_hours
+    aggregate = _SHARE_AGGREGATORS.get(engine)
+    if aggregate is None:
+        raise ValueError(f"Unsupported engine: {engine}. Supported: {', '.join(_SHARE_AGGREGATORS)}")
+    try:
+        totals = aggregate(df, date_col, tips_col, hours_col, name_col)
+    except ImportError:
+        logger.warning("%s is not installed, falling back to the pandas engine", engine)
+        totals = _aggregate_shares(df, date_col, tips_col, hours_col, name_col)
+    # Shares were computed in cents; convert back to dollars once
+    shares = totals["share"] / 100
+    final_tip_distribution: Dict[str, float] = shares.to_dict()
 
     # Create export DataFrame with employee name, total hours, and total tip share
-    export_data = []
-    for name in final_tip_distribution.keys():
-        export_data.append({
-            "Employee Name": name,
-            "Total Hours Worked": round(employee_hours_worked.get(name, 0.0), 2),
-            "Total Tip Share": round(final_tip_distribution[name], 2)
-        })
-    
-    export_df = pd.DataFrame(export_data)
-    # Sort by employee name for consistent output
-    export_df = export_df.sort_values("Employee Name").reset_index(drop=True)
-    
+    export_df = pd.DataFrame({
+        "Employee Name": totals.index,
+        "Total Hours Worked": totals[hours_col].round(2).to_numpy(),
+        "Total Tip Share": shares.round(2).to_numpy(),
+    })
+
     # Add summary row with totals
     summary_row = pd.DataFrame([{
         "Employee Name": "TOTAL",
@@ -656,15 +889,69 @@ def distribute_daily_tips(
     tips_col: str,
     hours_col: str,
     name_col: str,
+    output_format: str = "xlsx",
 ) -> Optional[Dict[str, float]]:
-    """Backward-compatible wrapper: read from path and write to path using the df-based helper."""
-    # Allow a single path or a list of paths
-    if isinstance(input_file_path, list):
-        dfs = [pd.read_excel(p) for p in input_file_path]
-        df = pd.concat(dfs, ignore_index=True)
+    """Backward-compatible wrapper: read from path and write to path using the df-based helper.
+
+    Inputs may be Excel or CSV files.
+    output_format is "xlsx" (default) or "parquet"; parquet needs pyarrow installed.
+    """
+    if output_format not in ("xlsx", "parquet"):
+        raise ValueError(f"Unsupported output format: {output_format}. Supported: xlsx, parquet")
+
+    # Allow a single path or a list of paths. Several files are parsed in parallel
+    # threads; the parsers spend most of their time in C code that releases the GIL.
+    paths = input_file_path if isinstance(input_file_path, list) else [input_file_path]
+    if len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+            dfs = list(pool.map(_read_path, paths))
     else:
-        df = pd.read_excel(input_file_path)
+        dfs = [_read_path(path) for path in paths]
 
-    final, export_df = distribute_daily_tips_df(df, date_col, tips_col, hours_col, name_col)
-    export_df.to_excel(output_file_path, index=False, sheet_name="Tip Distribution Summary")
+    return distribute_daily_tips_from_dfs(
+        dfs, output_file_path, date_col, tips_col, hours_col, name_col, output_format=output_format
+    )
+
+
+def distribute_daily_tips_from_dfs(
+    dfs: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    output: Union[str, BinaryIO],
+    date_col: Optional[str],
+    tips_col: Optional[str],
+    hours_col: Optional[str],
+    name_col: Optional[str],
+    output_format: str = "xlsx",
+) -> Dict[str, float]:
+    """Distribute tips over pre-loaded DataFrames and write the summary to `output`.
+
+    `output` may be a path or a writable binary stream such as a BytesIO, so
+    callers that already hold DataFrames skip the file round-trip entirely.
+    output_format is "xlsx" (default) or "parquet"; parquet needs pyarrow installed.
+    """
+    if output_format not in ("xlsx", "parquet"):
+        raise ValueError(f"Unsupported output format: {output_format}. Supported: xlsx, parquet")
+
+    final, export_df = distribute_daily_tips_df(dfs, date_col, tips_col, hours_col, name_col)
+    if output_format == "parquet":
+        export_df.to_parquet(output, index=False)
+    else:
+        _write_summary_excel(export_df, output)
     return final
+
+
+def _read_path(path) -> pd.DataFrame:
+    """Read one input file through the same single-parse pipeline as uploads
+    (Excel or CSV, report headers skipped), parsing from the open file."""
+    with open(path, "rb") as f:
+        return read_file_to_df(f, str(path))
+
+
+def _write_summary_excel(export_df: pd.DataFrame, output) -> None:
+    """Write the summary sheet to a path or file-like object.
+
+    With xlsxwriter, constant_memory mode streams rows out as they are written
+    instead of holding the whole workbook in memory.
+    """
+    engine_kwargs = {"options": {"constant_memory": True}} if EXCEL_WRITE_ENGINE == "xlsxwriter" else None
+    with pd.ExcelWriter(output, engine=EXCEL_WRITE_ENGINE, engine_kwargs=engine_kwargs) as writer:
+        export_df.to_excel(writer, index=False, sheet_name="Tip Distribution Summary")
@@ -4,39 +4,66 @@ Usage examples (PowerShell):
   python cli.py tip --amount 100 --percent 15
   python cli.py pay --hours 40 --rate 15.50
 """
-from argparse import ArgumentParser
-from decimal import Decimal
-from calculator.core import calculate_tip, calculate_total, calculate_pay
+import sys
+from argparse import ArgumentParser, ArgumentTypeError
+
+
+def _decimal_arg(value):
+    """argparse type: parse a Decimal, reporting bad input as a usage error."""
+    from decimal import Decimal, InvalidOperation
+
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ArgumentTypeError(f"invalid number: {value!r}")
+
+
+def _build_tip_parser(p_tip):
+    p_tip.add_argument("--amount", required=True, type=_decimal_arg, help="Base amount (e.g., 100.00)")
+    p_tip.add_argument("--percent", required=True, type=_decimal_arg, help="Tip percent (e.g., 15)")
+
+
+def _build_pay_parser(p_pay):
+    p_pay.add_argument("--hours", required=True, type=_decimal_arg, help="Hours worked (e.g., 40)")
+    p_pay.add_argument("--rate", required=True, type=_decimal_arg, help="Hourly rate (e.g., 15.50)")
+
+
+# Subcommand name -> (help text, function adding its arguments)
+_SUBCOMMANDS = {
+    "tip": ("Calculate tip and total", _build_tip_parser),
+    "pay": ("Calculate pay from hours and rate", _build_pay_parser),
+}
 
 
 def main():
     parser = ArgumentParser(prog="tip-hours")
     sub = parser.add_subparsers(dest="cmd")
 
-    p_tip = sub.add_parser("tip", help="Calculate tip and total")
-    p_tip.add_argument("--amount", required=True, help="Base amount (e.g., 100.00)")
-    p_tip.add_argument("--percent", required=True, help="Tip percent (e.g., 15)")
-
-    p_pay = sub.add_parser("pay", help="Calculate pay from hours and rate")
-    p_pay.add_argument("--hours", required=True, help="Hours worked (e.g., 40)")
-    p_pay.add_argument("--rate", required=True, help="Hourly rate (e.g., 15.50)")
+    # Only the subcommand actually invoked gets its arguments; the others are
+    # registered by name so the top-level help still lists them
+    cmd = next((arg for arg in sys.argv[1:] if not arg.startswith("-")), None)
+    for name, (help_text, build) in _SUBCOMMANDS.items():
+        p = sub.add_parser(name, help=help_text)
+        if name == cmd:
+            build(p)
 
     args = parser.parse_args()
+    # Imported per command so --help and usage errors don't pay for them
     if args.cmd == "tip":
-        amount = Decimal(args.amount)
-        percent = Decimal(args.percent)
+        from calculator.core import calculate_tip, calculate_total
+
+        amount = args.amount
+        percent = args.percent
         tip = calculate_tip(amount, percent)
         total = calculate_total(amount, percent)
-        print(f"Amount: {amount:.2f}")
-        print(f"Tip ({percent}%): {tip:.2f}")
-        print(f"Total: {total:.2f}")
+        sys.stdout.write(f"Amount: {amount:.2f}\nTip ({percent}%): {tip:.2f}\nTotal: {total:.2f}\n")
     elif args.cmd == "pay":
-        hours = Decimal(args.hours)
-        rate = Decimal(args.rate)
+        from calculator.core import calculate_pay
+
+        hours = args.hours
+        rate = args.rate
         pay = calculate_pay(hours, rate)
-        print(f"Hours: {hours}")
-        print(f"Rate: {rate:.2f}")
-        print(f"Pay: {pay:.2f}")
+        sys.stdout.write(f"Hours: {hours}\nRate: {rate:.2f}\nPay: {pay:.2f}\n")
     else:
         parser.print_help()
 
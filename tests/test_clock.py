@@ -1,6 +1,6 @@
 """Tests for clock/timesheet processing."""
 import pandas as pd
-from calculator.clock import process_clock_csv
+from calculator.clock import process_clock_csv, process_clock_csv_path
 
 
 def test_process_clock_csv_basic():
@@ -82,3 +82,23 @@ def test_process_clock_csv_missing_column():
         assert False, "Should have raised KeyError"
     except KeyError as e:
         assert "Clock In Date" in str(e)
+
+
+def test_process_clock_csv_path_chunks_match_in_memory(tmp_path):
+    """Test chunked reading from disk gives the same totals as the in-memory version."""
+    csv_file = tmp_path / "clock.csv"
+    csv_file.write_text(
+        "SHIFTS,,,\n"
+        "Employee ID,Employee Name,Clock In Date,Elapsed Hours\n"
+        "1,Alice,01-Jan-25,4.0\n"
+        "2,Bob,01-Jan-25,6.0\n"
+        "1,Alice,01-Jan-25,3.5\n"
+        "1,Alice,02-Jan-25,8.0\n"
+        "2,Bob,02-Jan-25,bad\n"
+    )
+
+    result = process_clock_csv_path(str(csv_file), chunksize=2, skiprows=1)
+    expected = process_clock_csv(pd.read_csv(csv_file, skiprows=1))
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["Total Daily Hours"].tolist() == [7.5, 8.0, 6.0]
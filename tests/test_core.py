@@ -1,4 +1,4 @@
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 import pytest
 
 from calculator.core import calculate_tip, calculate_total, calculate_pay
@@ -46,3 +46,46 @@ def test_accepts_floats_and_strings():
     # ensure function accepts floats/strings and returns Decimal rounded
     assert calculate_tip(100, 15) == Decimal("15.00")
     assert calculate_tip("10", "0.5") == Decimal("0.05")
+
+
+@pytest.mark.parametrize(
+    "amount,percent",
+    [("100", "15"), ("1", "0.5"), ("19.99", "18"), ("0.05", "12.5"), ("10.005", "15"), ("33.33", "17.777")],
+)
+def test_calculate_tip_cents_matches_decimal(amount, percent):
+    expected = (Decimal(amount) * Decimal(percent) / 100).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    assert calculate_tip(amount, percent) == expected
+
+
+def test_calculate_tip_cents_and_batch():
+    from calculator.core import calculate_tip_cents, calculate_tip_batch
+
+    assert calculate_tip_cents(10000, 1500) == 1500
+    assert calculate_tip_cents(100, 50) == 1
+    assert str(calculate_tip("19.99", "18")) == "3.60"
+    assert calculate_tip_batch([10000, 100, 1999], 1800).tolist() == [1800, 18, 360]
+    with pytest.raises(ValueError):
+        calculate_tip_cents(-1, 1500)
+    with pytest.raises(ValueError):
+        calculate_tip_batch([100, -5], 1500)
+
+
+@pytest.mark.parametrize(
+    "hours,rate",
+    [("40", "15.50"), ("7.25", "13.33"), ("0.01", "0.5"), ("2.345", "10"), ("8", "12.125")],
+)
+def test_calculate_pay_cents_matches_decimal(hours, rate):
+    expected = (Decimal(hours) * Decimal(rate)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    assert calculate_pay(hours, rate) == expected
+
+
+def test_calculate_pay_cents_and_batch_percents():
+    from calculator.core import calculate_pay_cents, calculate_tip_batch
+
+    assert calculate_pay_cents(4000, 1550) == 62000
+    assert str(calculate_pay("7.25", "13.33")) == "96.64"
+    with pytest.raises(ValueError):
+        calculate_pay_cents(-1, 1550)
+    assert calculate_tip_batch([10000, 10000, 1999], [1500, 2000, 1800]).tolist() == [1500, 2000, 360]
+    with pytest.raises(ValueError):
+        calculate_tip_batch([100, 100], [1500, -1])
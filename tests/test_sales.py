@@ -1,6 +1,6 @@
 """Tests for sales data processing."""
 import pandas as pd
-from calculator.sales import process_sales_csv
+from calculator.sales import process_sales_csv, process_sales_path
 
 
 def test_process_sales_csv_basic():
@@ -93,3 +93,21 @@ def test_process_sales_csv_with_nan_values():
     # Should have valid records
     assert len(result) >= 1
     assert "Tip Amount" in result.columns
+
+
+def test_process_sales_path(tmp_path):
+    """Test reading a sales CSV straight from disk."""
+    csv_file = tmp_path / "sales.csv"
+    csv_file.write_text(
+        "Sales,Metric,Col3\n"
+        "2025-01-01,2025-01-02,2025-01-03\n"
+        "Item A,units,10\n"
+        'Tips,"$1,150.00",$(20.00)\n'
+    )
+
+    result = process_sales_path(str(csv_file), data_start_col=1)
+
+    assert result["Tip Amount"].tolist() == [1150.0, -20.0]
+    assert result["Date"].tolist() == ["2025-01-02", "2025-01-03"]
+    # Arrow-backed strings stay internal; callers get the same dtype as astype(str)
+    assert result["Date"].dtype == pd.Series(["2025-01-02"], dtype=object).astype(str).dtype
@@ -1,4 +1,6 @@
+import io
 import pandas as pd
+import pytest
 from decimal import Decimal
 from calculator.tips import distribute_daily_tips, read_file_to_df
 import tempfile
@@ -35,33 +37,25 @@ def test_distribute_daily_tips(tmp_path):
     assert "Total Tip Share" in out_df.columns
 
 
-def test_distribute_two_input_files(tmp_path):
-    # First file: one day's tips and hours
-    data1 = [
+def test_distribute_two_input_frames_in_memory():
+    from calculator.tips import distribute_daily_tips_from_dfs
+
+    # First frame: one day's tips and hours
+    df1 = pd.DataFrame([
         {"Shift Date": "2025-11-03", "Daily Tip Total": 80.0, "Hours Worked": 4.0, "Employee Name": "Carol"},
         {"Shift Date": "2025-11-03", "Daily Tip Total": 0.0, "Hours Worked": 4.0, "Employee Name": "Dave"},
-    ]
+    ])
 
-    # Second file: another day's tips and hours
-    data2 = [
+    # Second frame: another day's tips and hours
+    df2 = pd.DataFrame([
         {"Shift Date": "2025-11-04", "Daily Tip Total": 40.0, "Hours Worked": 2.0, "Employee Name": "Carol"},
         {"Shift Date": "2025-11-04", "Daily Tip Total": 0.0, "Hours Worked": 6.0, "Employee Name": "Eve"},
-    ]
-
-    df1 = pd.DataFrame(data1)
-    df2 = pd.DataFrame(data2)
-
-    input_file1 = tmp_path / "input1.xlsx"
-    input_file2 = tmp_path / "input2.xlsx"
-    output_file = tmp_path / "output_multi.xlsx"
-
-    df1.to_excel(input_file1, index=False)
-    df2.to_excel(input_file2, index=False)
+    ])
 
-    # Pass a list of input paths to the wrapper
-    result = distribute_daily_tips(
-        [str(input_file1), str(input_file2)],
-        str(output_file),
+    output = io.BytesIO()
+    result = distribute_daily_tips_from_dfs(
+        [df1, df2],
+        output,
         "Shift Date",
         "Daily Tip Total",
         "Hours Worked",
@@ -75,11 +69,42 @@ def test_distribute_two_input_files(tmp_path):
     assert round(result.get("Dave", 0.0), 2) == 40.0
     assert round(result.get("Eve", 0.0), 2) == 30.0
 
-    out_df = pd.read_excel(output_file, sheet_name="Tip Distribution Summary")
+    output.seek(0)
+    out_df = pd.read_excel(output, sheet_name="Tip Distribution Summary")
     assert "Employee Name" in out_df.columns
     assert "Total Tip Share" in out_df.columns
 
 
+def test_distribute_two_input_paths_matches_separate_reads(tmp_path):
+    from calculator.tips import distribute_daily_tips_from_dfs
+
+    cols = ("Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name")
+    csv_file = tmp_path / "day1.csv"
+    csv_file.write_text(
+        "Shift Date,Daily Tip Total,Hours Worked,Employee Name\n"
+        "2025-11-03,80.0,4.0,Carol\n"
+        "2025-11-03,0.0,4.0,Dave\n"
+    )
+    xlsx_file = tmp_path / "day2.xlsx"
+    with pd.ExcelWriter(xlsx_file, engine="xlsxwriter") as w:
+        pd.DataFrame([
+            {"Shift Date": "2025-11-04", "Daily Tip Total": 40.0, "Hours Worked": 2.0, "Employee Name": "Carol"},
+            {"Shift Date": "2025-11-04", "Daily Tip Total": 0.0, "Hours Worked": 6.0, "Employee Name": "Eve"},
+        ]).to_excel(w, index=False)
+
+    pooled_out = tmp_path / "pooled.xlsx"
+    pooled = distribute_daily_tips([str(csv_file), str(xlsx_file)], str(pooled_out), *cols)
+
+    separate = [read_file_to_df(path.read_bytes(), path.name) for path in (csv_file, xlsx_file)]
+    separate_out = io.BytesIO()
+    expected = distribute_daily_tips_from_dfs(separate, separate_out, *cols)
+
+    assert pooled == pytest.approx(expected)
+    assert pooled == pytest.approx({"Carol": 50.0, "Dave": 40.0, "Eve": 30.0})
+    separate_out.seek(0)
+    pd.testing.assert_frame_equal(pd.read_excel(pooled_out), pd.read_excel(separate_out))
+
+
 def test_auto_detect_columns(tmp_path):
     # Non-standard column names
     data = [
@@ -99,6 +124,21 @@ def test_auto_detect_columns(tmp_path):
     assert round(final.get("Hank", 0.0), 2) == 31.25
 
 
+def test_auto_detect_fuzzy_column():
+    # Misspelled tips header is picked up by the fuzzy fallback
+    df = pd.DataFrame([
+        {"Date": "2025-11-05", "Tps": 30.0, "Hours": 1.0, "Name": "Ivy"},
+        {"Date": "2025-11-05", "Tps": 0.0, "Hours": 2.0, "Name": "Jack"},
+    ])
+
+    from calculator.tips import distribute_daily_tips_df
+
+    final, _ = distribute_daily_tips_df(df, None, None, None, None)
+
+    assert round(final.get("Ivy", 0.0), 2) == 10.0
+    assert round(final.get("Jack", 0.0), 2) == 20.0
+
+
 def test_read_csv_file(tmp_path):
     # Create a CSV file
     csv_file = tmp_path / "test.csv"
@@ -119,6 +159,52 @@ def test_read_csv_file(tmp_path):
     assert "Shift Date" in df.columns
 
 
+def test_distribute_daily_tips_csv_path_with_report_title(tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text(
+        "Weekly Tips Report,,,\n"
+        "Shift Date,Daily Tip Total,Hours Worked,Employee Name\n"
+        "2025-11-08,90.0,1.0,Pia\n"
+        "2025-11-08,0.0,2.0,Quinn\n"
+    )
+    output_file = tmp_path / "output.xlsx"
+
+    result = distribute_daily_tips(
+        str(input_file), str(output_file), "Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name"
+    )
+
+    # 90 split 1/3 -> Pia 30, Quinn 60
+    assert round(result["Pia"], 2) == 30.0
+    assert round(result["Quinn"], 2) == 60.0
+
+
+def test_distribute_daily_tips_csv_path_with_blank_line_after_title(tmp_path):
+    input_file = tmp_path / "input.csv"
+    input_file.write_text(
+        "Weekly Tips Report,,,\n"
+        "\n"
+        "Shift Date,Daily Tip Total,Hours Worked,Employee Name\n"
+        "2025-11-08,90.0,1.0,Pia\n"
+        "\n"
+        "2025-11-08,0.0,2.0,Quinn\n"
+    )
+    output_file = tmp_path / "output.xlsx"
+
+    result = distribute_daily_tips(
+        str(input_file), str(output_file), "Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name"
+    )
+
+    assert round(result["Pia"], 2) == 30.0
+    assert round(result["Quinn"], 2) == 60.0
+
+
+def test_read_file_to_df_rejects_mismatched_content():
+    with pytest.raises(ValueError, match="not a valid Excel workbook"):
+        read_file_to_df(b"Shift Date,Tips\n2025-11-06,40\n", "input.xlsx")
+    with pytest.raises(ValueError, match="not a text CSV"):
+        read_file_to_df(b"PK\x03\x04\x00\x00binary", "input.csv")
+
+
 def test_distribute_csv_and_excel_mixed(tmp_path):
     # CSV file
     csv_file = tmp_path / "input.csv"
@@ -147,3 +233,192 @@ def test_distribute_csv_and_excel_mixed(tmp_path):
     # 60 split 3/6 -> Noah 30, Olivia 30
     assert round(final.get("Noah", 0.0), 2) == 30.0
     assert round(final.get("Olivia", 0.0), 2) == 30.0
+
+
+def test_distribute_skips_zero_hour_rows_and_empty_days():
+    from calculator.tips import distribute_daily_tips_df
+
+    data = [
+        {"Shift Date": "2025-11-08", "Daily Tip Total": 90.0, "Hours Worked": 2.0, "Employee Name": "Pat"},
+        {"Shift Date": "2025-11-08", "Daily Tip Total": 0.0, "Hours Worked": 4.0, "Employee Name": "Quinn"},
+        {"Shift Date": "2025-11-08", "Daily Tip Total": 0.0, "Hours Worked": 0.0, "Employee Name": "Ray"},
+        # No tips on this day, so nobody earns a share or logged hours for it
+        {"Shift Date": "2025-11-09", "Daily Tip Total": 0.0, "Hours Worked": 8.0, "Employee Name": "Ray"},
+    ]
+
+    final, export_df = distribute_daily_tips_df(
+        pd.DataFrame(data), "Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name"
+    )
+
+    assert final == {"Pat": 30.0, "Quinn": 60.0}
+    assert export_df["Employee Name"].tolist() == ["Pat", "Quinn", "TOTAL"]
+    assert export_df["Total Hours Worked"].tolist() == [2.0, 4.0, 6.0]
+    assert export_df["Total Tip Share"].iloc[-1] == 90.0
+
+
+def test_empty_frame_iterable_is_treated_as_no_tips_data():
+    from calculator.tips import distribute_daily_tips_df
+
+    clock_df = pd.DataFrame([
+        {"Employee": "Ann", "Date": "2025-11-10", "Hours": 3.0},
+        {"Employee": "Bob", "Date": "2025-11-10", "Hours": 5.0},
+    ])
+
+    with pytest.raises(ValueError, match="must be provided"):
+        distribute_daily_tips_df(iter([]), None, None, None, None)
+
+    _, export_df = distribute_daily_tips_df(iter([]), None, None, None, None, clock_df=clock_df)
+    assert export_df["Employee Name"].tolist() == ["Ann", "Bob"]
+
+
+@pytest.mark.parametrize("engine", ["polars", "numba"])
+def test_optional_engines_match_pandas(engine):
+    pytest.importorskip(engine)
+    from calculator.tips import distribute_daily_tips_df
+
+    data = [
+        {"Shift Date": "2025-11-08", "Daily Tip Total": 90.0, "Hours Worked": 2.0, "Employee Name": "Quinn"},
+        {"Shift Date": "2025-11-08", "Daily Tip Total": 0.0, "Hours Worked": 4.0, "Employee Name": "Pat"},
+        {"Shift Date": "2025-11-08", "Daily Tip Total": 0.0, "Hours Worked": 3.0, "Employee Name": None},
+        {"Shift Date": "2025-11-09", "Daily Tip Total": 50.0, "Hours Worked": 5.0, "Employee Name": "Pat"},
+        {"Shift Date": "2025-11-09", "Daily Tip Total": 0.0, "Hours Worked": 0.0, "Employee Name": "Ray"},
+        {"Shift Date": "2025-11-09", "Daily Tip Total": 0.0, "Hours Worked": 1.0, "Employee Name": "Zed"},
+        {"Shift Date": "2025-11-09", "Daily Tip Total": 0.0, "Hours Worked": 2.0, "Employee Name": "Abe"},
+        # Zero-hour day: its tips go to nobody
+        {"Shift Date": "2025-11-10", "Daily Tip Total": 30.0, "Hours Worked": 0.0, "Employee Name": "Quinn"},
+        {"Shift Date": "2025-11-10", "Daily Tip Total": 0.0, "Hours Worked": 0.0, "Employee Name": "Abe"},
+        # Zero-tip day: its hours are not counted
+        {"Shift Date": "2025-11-11", "Daily Tip Total": 0.0, "Hours Worked": 3.0, "Employee Name": "Zed"},
+        {"Shift Date": "2025-11-11", "Daily Tip Total": 0.0, "Hours Worked": 2.0, "Employee Name": "Pat"},
+    ]
+    df = pd.DataFrame(data)
+    cols = ("Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name")
+
+    final_pd, export_pd = distribute_daily_tips_df(df, *cols)
+    final_other, export_other = distribute_daily_tips_df(df, *cols, engine=engine)
+
+    assert export_pd["Employee Name"].tolist() == ["Abe", "Pat", "Quinn", "Zed", "TOTAL"]
+    assert list(final_other) == list(final_pd)
+    assert final_other == pytest.approx(final_pd)
+    pd.testing.assert_frame_equal(export_other, export_pd)
+
+
+def test_unknown_engine_raises():
+    from calculator.tips import distribute_daily_tips_df
+
+    df = pd.DataFrame([{"Shift Date": "2025-11-08", "Daily Tip Total": 1.0, "Hours Worked": 1.0, "Employee Name": "Pat"}])
+    with pytest.raises(ValueError):
+        distribute_daily_tips_df(df, "Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name", engine="spark")
+
+
+def test_distribute_daily_tips_parquet_output(tmp_path):
+    pytest.importorskip("pyarrow")
+    data = [
+        {"Shift Date": "2025-11-12", "Daily Tip Total": 20.0, "Hours Worked": 1.0, "Employee Name": "Sam"},
+        {"Shift Date": "2025-11-12", "Daily Tip Total": 0.0, "Hours Worked": 3.0, "Employee Name": "Tess"},
+    ]
+    input_file = tmp_path / "input.xlsx"
+    output_file = tmp_path / "output.parquet"
+    pd.DataFrame(data).to_excel(input_file, index=False)
+
+    result = distribute_daily_tips(
+        str(input_file), str(output_file), "Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name",
+        output_format="parquet",
+    )
+
+    assert result == {"Sam": 5.0, "Tess": 15.0}
+    out_df = pd.read_parquet(output_file)
+    assert out_df["Employee Name"].tolist() == ["Sam", "Tess", "TOTAL"]
+
+
+def test_daily_total_tips_expanded_with_clock_hours():
+    from calculator.tips import distribute_daily_tips_df
+
+    tips_df = pd.DataFrame([
+        {"Employee": "Daily Tips", "Date": "2025-06-28", "Hours": 1, "Tips": 100.0},
+        {"Employee": "Daily Tips", "Date": "2025-06-29", "Hours": 1, "Tips": 50.0},
+    ])
+    clock_df = pd.DataFrame([
+        {"Employee Name": "Uma", "Clock In Date": "28-Jun-25", "Elapsed Hours": 2.0},
+        {"Employee Name": "Vic", "Clock In Date": "28-Jun-25", "Elapsed Hours": 6.0},
+        {"Employee Name": "Uma", "Clock In Date": "29-Jun-25", "Elapsed Hours": 4.0},
+    ])
+
+    final, export_df = distribute_daily_tips_df(tips_df, "Date", "Tips", "Hours", "Employee", clock_df=clock_df)
+
+    # 28-Jun: 100 split 2/8 -> Uma 25, Vic 75; 29-Jun: Uma alone gets 50
+    assert final == {"Uma": 75.0, "Vic": 75.0}
+    assert export_df["Total Hours Worked"].tolist() == [6.0, 6.0, 12.0]
+
+
+def test_per_employee_tips_use_clock_hours():
+    from calculator.tips import distribute_daily_tips_df
+
+    tips_df = pd.DataFrame([
+        {"Date": "2025-11-05", "Tips": 40.0, "Hours": 1.0, "Name": "Ann"},
+        {"Date": "2025-11-05", "Tips": 0.0, "Hours": 1.0, "Name": "Bob"},
+        {"Date": "2025-11-06", "Tips": 30.0, "Hours": 1.0, "Name": "Ann"},
+    ])
+    clock_df = pd.DataFrame([
+        {"Employee Name": "Ann", "Clock In Date": "05-Nov-25", "Elapsed Hours": 2.0},
+        {"Employee Name": "Bob", "Clock In Date": "05-Nov-25", "Elapsed Hours": 6.0},
+    ])
+
+    final, export_df = distribute_daily_tips_df(tips_df, "Date", "Tips", "Hours", "Name", clock_df=clock_df)
+
+    # 05-Nov uses clock hours: 40 split 2/8 -> Ann 10, Bob 30; 06-Nov has no clock
+    # entry, so Ann keeps the tips-file hour and all 30
+    assert final == {"Ann": 40.0, "Bob": 30.0}
+    assert export_df["Total Hours Worked"].tolist() == [3.0, 6.0, 9.0]
+
+
+def test_to_cents_rounds_half_up():
+    from calculator.tips import _to_cents
+
+    cents = _to_cents(pd.Series([0.285, 1.005, -2.675, 12.3, 0.0]))
+
+    assert cents.dtype == "int64"
+    assert cents.tolist() == [29, 101, -268, 1230, 0]
+
+
+def test_infinite_tip_amount_raises():
+    from calculator.tips import distribute_daily_tips_df
+
+    df = pd.DataFrame([
+        {"Shift Date": "2025-11-08", "Daily Tip Total": "inf", "Hours Worked": 2.0, "Employee Name": "Pat"},
+        {"Shift Date": "2025-11-08", "Daily Tip Total": 10.0, "Hours Worked": 2.0, "Employee Name": "Quinn"},
+    ])
+
+    with pytest.raises(ValueError, match="finite"):
+        distribute_daily_tips_df(df, "Shift Date", "Daily Tip Total", "Hours Worked", "Employee Name")
+
+
+def test_transposed_sales_report_short_dates_use_detected_year():
+    from calculator.tips import _extract_from_transposed_sales_report, _read_raw
+
+    report = (
+        "Sales Report,,,,,\n"
+        '"Sat, Jun 28, 2025 - Tue, Jul 1, 2025",,,,,\n'
+        ",,,,,\n"
+        ",Total,28-Jun,29-Jun,30-Jun,1-Jul\n"
+        'Gross sales,"$1,000.00",$400.00,$300.00,$200.00,$100.00\n'
+        "Tips,$100.00,$40.00,$30.00,$20.00,$10.00\n"
+    ).encode()
+
+    result = _extract_from_transposed_sales_report(_read_raw(report, "sales.csv"))
+
+    assert result["Date"].dt.strftime("%Y-%m-%d").tolist() == ["2025-06-28", "2025-06-29", "2025-06-30", "2025-07-01"]
+    assert result["Tips"].tolist() == [40.0, 30.0, 20.0, 10.0]
+
+
+def test_is_clock_file_by_columns():
+    from calculator.tips import is_clock_file
+
+    clock = pd.DataFrame(columns=["Employee Name", "Clock In Date", "Elapsed Hours"])
+    tips = pd.DataFrame(columns=["Employee Name", "Shift Date", "Hours Worked", "Daily Tip Total"])
+
+    assert is_clock_file(clock)
+    assert not is_clock_file(tips)
+    assert not is_clock_file(pd.DataFrame(columns=[0, 1, 2]))
+    # Filename hints win over columns
+    assert not is_clock_file(clock, "sales_report.xlsx")
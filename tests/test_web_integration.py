@@ -5,7 +5,7 @@ from flask import url_for
 
 def make_excel_bytes(df: pd.DataFrame) -> bytes:
     bio = io.BytesIO()
-    with pd.ExcelWriter(bio, engine="openpyxl") as w:
+    with pd.ExcelWriter(bio, engine="xlsxwriter") as w:
         df.to_excel(w, index=False)
     return bio.getvalue()
 
@@ -53,3 +53,46 @@ def test_flask_upload_two_files_returns_pdf(tmp_path):
     # Response should be a PDF attachment
     assert "application/pdf" in resp.content_type
     assert b"%PDF" in resp.data  # PDF files start with %PDF magic number
+
+
+def test_basic_auth_protects_routes_except_health(monkeypatch):
+    import base64
+    import web_app
+
+    monkeypatch.setattr(web_app, "BASIC_AUTH_USERNAME", "admin")
+    monkeypatch.setattr(web_app, "BASIC_AUTH_PASSWORD", "s3cret")
+    client = web_app.app.test_client()
+
+    def auth(credentials):
+        return {"Authorization": "Basic " + base64.b64encode(credentials).decode()}
+
+    assert client.get("/health").status_code == 200
+    resp = client.get("/ready")
+    assert resp.status_code == 401
+    assert "Basic" in resp.headers["WWW-Authenticate"]
+    assert client.get("/ready", headers=auth(b"admin:wrong")).status_code == 401
+    assert client.get("/ready", headers=auth(b"admin:s3cret")).status_code == 200
+
+
+def test_index_page_cache_still_shows_flash_messages():
+    from web_app import app
+
+    client = app.test_client()
+
+    plain = client.get("/").data
+    assert client.get("/").data == plain
+
+    resp = client.post(
+        "/", data={"files": [(io.BytesIO(b"x"), "notes.txt")]}, content_type="multipart/form-data"
+    )
+    assert b"Unsupported file type" in resp.data
+    assert client.get("/").data == plain
+
+
+def test_report_period_appends_detected_year_to_day_month_values():
+    from web_app import _report_period
+
+    tips = pd.DataFrame({"Date": ["2024-03-10", "15-Mar", "15-Mar", "02-Apr", None]})
+    assert _report_period(tips) == (pd.Timestamp("2024-03-15"), pd.Timestamp("2024-04-02"))
+
+    assert _report_period(pd.DataFrame({"Tips": [1.0]})) is None
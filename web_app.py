@@ -1,146 +1,165 @@
-from flask import Flask, request, render_template, send_file, flash, jsonify
+from flask import Flask, request, render_template, send_file, flash, jsonify, session
+import hmac
 import io
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from calculator.tips import distribute_daily_tips_df, read_file_to_df, _extract_from_transposed_sales_report
+from importlib.util import find_spec
+
+# pandas, reportlab and the calculator modules are imported once at startup
+# (gunicorn workers pay for them before the first request).
+import pandas as pd
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.enums import TA_CENTER
+from calculator.tips import (
+    distribute_daily_tips_df,
+    is_clock_file,
+    _read_raw,
+    _apply_header,
+    _extract_from_transposed_sales_report,
+    _lower_columns,
+    EXCEL_READ_ENGINE,
+)
 from calculator.clock import process_clock_csv
 
 logger = logging.getLogger(__name__)
 
 
-def _generate_pdf_report(export_df, tips_df=None):
+# PDF styles do not depend on the data, so they are built once at import.
+_STYLES = getSampleStyleSheet()
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=16,
+    textColor=colors.HexColor('#333333'),
+    spaceAfter=6,
+    alignment=TA_CENTER
+)
+_DATE_STYLE = ParagraphStyle(
+    'DateStyle',
+    parent=_STYLES['Normal'],
+    fontSize=10,
+    textColor=colors.HexColor('#666666'),
+    spaceAfter=12,
+    alignment=TA_CENTER
+)
+_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 11),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    
+    # Data rows
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -2), 10),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f9f9f9')]),
+    
+    # Total row (last row)
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e3e9ff')),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, -1), (-1, -1), 11),
+    ('TOPPADDING', (0, -1), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, -1), (-1, -1), 12),
+    
+    # Grid
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dddddd')),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+# Bound format methods for the table cells, looked up once
+_HOURS_FMT = "{:.2f}".format
+_CURRENCY_FMT = "${:,.2f}".format
+
+
+def _report_period(tips_df):
+    """Return the (first, last) dates in a tips/sales DataFrame for the report.
+    
+    Daily sales sheets repeat each date on many rows, so only the unique values
+    are parsed. Returns None when there is no usable Date column or no date in
+    it parses.
+    """
+    if tips_df is None or 'Date' not in tips_df.columns:
+        return None
+    try:
+        raw = pd.Series(tips_df['Date'].dropna().unique())
+        # Try to parse dates with proper format detection
+        dates = pd.to_datetime(raw, errors='coerce')
+        
+        # If most dates failed to parse, try with explicit format
+        if dates.isna().sum() > len(dates) * 0.5:
+            # Detect year from first date value that carries one
+            text = raw.astype(str)
+            years = text.head(10).str.strip().str.extract(r'\b(20[0-9]{2})\b', expand=False).dropna()
+            
+            if len(years) > 0:
+                year_suffix = years.iloc[0][-2:]
+                # Try parsing with detected year appended to day-month values
+                needs_year = ~text.str[-3:].str.contains('-', regex=False)
+                text = text.where(~needs_year, text.str.strip() + f"-{year_suffix}")
+                dates = pd.to_datetime(text, format="%d-%b-%y", errors='coerce')
+        
+        dates = dates.dropna()
+        if len(dates) == 0:
+            return None
+        values = dates.to_numpy()
+        return pd.Timestamp(values.min()), pd.Timestamp(values.max())
+    except Exception:
+        return None
+
+
+def _generate_pdf_report(export_df, period=None):
     """Generate a PDF report from the export DataFrame using reportlab.
     
     Args:
         export_df: The final summary DataFrame with employee names, hours, and tips
-        tips_df: Optional tips/sales DataFrame to extract date range
+        period: Optional (first, last) dates from _report_period for the period line
     """
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-    
     # Create PDF in memory
     pdf_buffer = io.BytesIO()
     doc = SimpleDocTemplate(pdf_buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
     
     elements = []
-    styles = getSampleStyleSheet()
     
     # Title
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.HexColor('#333333'),
-        spaceAfter=6,
-        alignment=TA_CENTER
-    )
-    title = Paragraph("Tip & Hours Distribution Report", title_style)
+    title = Paragraph("Tip & Hours Distribution Report", _TITLE_STYLE)
     elements.append(title)
     
-    # Extract date range from tips_df if available
     date_range_text = f"Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
-    if tips_df is not None and 'Date' in tips_df.columns:
-        try:
-            import pandas as pd
-            import re
-            
-            # Try to parse dates with proper format detection
-            dates = pd.to_datetime(tips_df['Date'], errors='coerce')
-            
-            # If most dates failed to parse, try with explicit format
-            if dates.isna().sum() > len(dates) * 0.5:
-                # Detect year from first non-null date value
-                detected_year = None
-                for val in tips_df['Date'].dropna().head(10):
-                    val_str = str(val).strip()
-                    year_match = re.search(r'\b(20[0-9]{2})\b', val_str)
-                    if year_match:
-                        detected_year = year_match.group(1)
-                        break
-                
-                if detected_year:
-                    year_suffix = detected_year[-2:]
-                    # Try parsing with detected year
-                    dates = pd.to_datetime(
-                        tips_df['Date'].apply(
-                            lambda x: f"{str(x).strip()}-{year_suffix}" 
-                            if pd.notna(x) and '-' not in str(x)[-3:] else str(x)
-                        ),
-                        format="%d-%b-%y",
-                        errors='coerce'
-                    )
-            
-            dates = dates.dropna()
-            if len(dates) > 0:
-                min_date = dates.min().strftime('%B %d, %Y')
-                max_date = dates.max().strftime('%B %d, %Y')
-                date_range_text = f"Period: {min_date} to {max_date}<br/>Generated: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}"
-        except Exception as e:
-            pass  # Fallback to just generation date
+    if period is not None:
+        min_date = period[0].strftime('%B %d, %Y')
+        max_date = period[1].strftime('%B %d, %Y')
+        date_range_text = f"Period: {min_date} to {max_date}<br/>{date_range_text}"
     
     # Date/Period info
-    date_style = ParagraphStyle(
-        'DateStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        textColor=colors.HexColor('#666666'),
-        spaceAfter=12,
-        alignment=TA_CENTER
-    )
-    date_para = Paragraph(date_range_text, date_style)
+    date_para = Paragraph(date_range_text, _DATE_STYLE)
     elements.append(date_para)
     elements.append(Spacer(1, 0.2*inch))
     
     # Convert DataFrame to table data
-    table_data = [['Employee Name', 'Total Hours Worked', 'Total Tip Share']]
+    table_data = [('Employee Name', 'Total Hours Worked', 'Total Tip Share')]
     
-    for _, row in export_df.iterrows():
-        name = row['Employee Name']
-        hours = f"{row['Total Hours Worked']:.2f}"
-        tips = f"${row['Total Tip Share']:,.2f}"
-        
-        # Bold the TOTAL row
-        if name == 'TOTAL':
-            table_data.append([f"**{name}**", f"**{hours}**", f"**{tips}**"])
-        else:
-            table_data.append([name, hours, tips])
+    # Format whole columns at once rather than building a Series per row
+    names = export_df['Employee Name'].tolist()
+    hours = map(_HOURS_FMT, export_df['Total Hours Worked'].tolist())
+    tips = map(_CURRENCY_FMT, export_df['Total Tip Share'].tolist())
+    # The TOTAL row is last and is bolded by _TABLE_STYLE
+    table_data.extend(zip(names, hours, tips))
     
-    # Create table
-    table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1.5*inch])
+    # Create table; the header row repeats when a long roster spans pages
+    table = Table(table_data, colWidths=[3*inch, 1.5*inch, 1.5*inch], repeatRows=1)
     
     # Style the table
-    table.setStyle(TableStyle([
-        # Header row
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 11),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        
-        # Data rows
-        ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 1), (-1, -2), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -2), 10),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f9f9f9')]),
-        
-        # Total row (last row)
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#e3e9ff')),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, -1), (-1, -1), 11),
-        ('TOPPADDING', (0, -1), (-1, -1), 12),
-        ('BOTTOMPADDING', (0, -1), (-1, -1), 12),
-        
-        # Grid
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dddddd')),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    table.setStyle(_TABLE_STYLE)
     
     elements.append(table)
     
@@ -161,7 +180,10 @@ app.secret_key = os.environ.get("SECRET_KEY", "dev-secret-for-local-testing-only
 
 # Production-friendly limits
 # Max upload size: default 16 MiB, can be overridden via env var MAX_CONTENT_LENGTH
-app.config["MAX_CONTENT_LENGTH"] = int(os.environ.get("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))
+MAX_CONTENT_LENGTH = int(os.environ.get("MAX_CONTENT_LENGTH", 16 * 1024 * 1024))
+app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
+# Formatted once; the 413 handler only renders it
+_TOO_LARGE_MSG = f"File too large. Max size is {MAX_CONTENT_LENGTH} bytes."
 
 # Optional Basic Auth: set BASIC_AUTH_USERNAME and BASIC_AUTH_PASSWORD in env to enable
 BASIC_AUTH_USERNAME = os.environ.get("BASIC_AUTH_USERNAME")
@@ -180,29 +202,79 @@ def _check_basic_auth():
     auth = request.authorization
     if not auth:
         return False
-    return auth.username == BASIC_AUTH_USERNAME and auth.password == BASIC_AUTH_PASSWORD
+    # Constant-time comparisons (on bytes, so non-ASCII credentials work);
+    # & keeps the password check from being skipped
+    return hmac.compare_digest(
+        (auth.username or "").encode(), BASIC_AUTH_USERNAME.encode()
+    ) & hmac.compare_digest((auth.password or "").encode(), BASIC_AUTH_PASSWORD.encode())
 
 
 @app.before_request
 def require_basic_auth():
-    # Protect all routes when BASIC_AUTH_* are set
+    # Protect all routes except the liveness probe when BASIC_AUTH_* are set
+    if request.path == "/health":
+        return None
     if BASIC_AUTH_USERNAME and BASIC_AUTH_PASSWORD:
         if not _check_basic_auth():
-            return (
-                ("Unauthorized", 401, {"WWW-Authenticate": 'Basic realm="Login Required"'}),
-            )
+            return "Unauthorized", 401, {"WWW-Authenticate": 'Basic realm="Login Required"'}
+
+
+ALLOWED_EXTENSIONS = frozenset({"xlsx", "xls", "csv"})
+# Dotted suffixes for a single str.endswith check
+_ALLOWED_SUFFIXES = tuple(f".{ext}" for ext in sorted(ALLOWED_EXTENSIONS))
+
+
+def _parse_upload(f):
+    """Parse one upload once, returning (raw, header-applied frame, lowercased column map)."""
+    # Parse straight from the upload stream rather than a bytes copy of it
+    raw = _read_raw(f.stream, f.filename)
+    df = _apply_header(raw)
+    return raw, df, _lower_columns(df)
 
 
-ALLOWED_EXTENSIONS = {"xlsx", "xls", "csv"}
+# index.html only varies with the flashed messages, so the page without any is
+# rendered once and reused (except in debug mode, where templates may change)
+_INDEX_HTML = None
+
+
+def _render_index():
+    """Render index.html, reusing the cached page when there are no flash messages."""
+    global _INDEX_HTML
+    if "_flashes" in session or app.debug:
+        return render_template("index.html")
+    if _INDEX_HTML is None:
+        _INDEX_HTML = render_template("index.html")
+    return _INDEX_HTML
+
+
+PDF_MIMETYPE = "application/pdf"
+
+
+def _pdf_response(buf, download_name: str):
+    """Send an in-memory PDF as an attachment.
+
+    The report is generated fresh per request, so conditional-request handling
+    and ETag/Last-Modified generation are switched off.
+    """
+    buf.seek(0)
+    return send_file(
+        buf,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype=PDF_MIMETYPE,
+        conditional=False,
+        etag=False,
+        last_modified=None,
+    )
 
 
 def _allowed_file(filename: str) -> bool:
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    return filename.lower().endswith(_ALLOWED_SUFFIXES)
 
 
 @app.errorhandler(413)
 def request_entity_too_large(error):
-    return render_template("index.html", error="File too large. Max size is {} bytes.".format(app.config["MAX_CONTENT_LENGTH"])), 413
+    return render_template("index.html", error=_TOO_LARGE_MSG), 413
 
 
 @app.route("/health", methods=["GET"])
@@ -210,20 +282,15 @@ def health():
     return jsonify(status="ok"), 200
 
 
+# Readiness is decided once at import: pandas, reportlab and the calculator
+# modules are already loaded above, so what is left is an engine to read
+# Excel uploads with (calamine, or pandas' openpyxl default)
+_READY = EXCEL_READ_ENGINE is not None or find_spec("openpyxl") is not None
+
+
 @app.route("/ready", methods=["GET"])
 def ready():
-    # Basic readiness check: can import pandas and write an in-memory excel
-    try:
-        import pandas as pd
-        import tempfile
-
-        df = pd.DataFrame({"a": [1]})
-        with tempfile.TemporaryFile() as tf:
-            with pd.ExcelWriter(tf, engine="openpyxl") as w:
-                df.to_excel(w, index=False)
-        return jsonify(ready=True), 200
-    except Exception:
-        return jsonify(ready=False), 500
+    return jsonify(ready=_READY), 200 if _READY else 500
 
 
 @app.route("/", methods=["GET", "POST"])
@@ -233,7 +300,7 @@ def index():
         uploaded_files = request.files.getlist("files")
         if not uploaded_files or all(f.filename == "" for f in uploaded_files):
             flash("Please upload at least one file.")
-            return render_template("index.html")
+            return _render_index()
 
         # Validate and separate files into clock and tips
         valid_files = []
@@ -243,34 +310,35 @@ def index():
         
         if not valid_files:
             flash("Unsupported file type. Please upload .xlsx, .xls, or .csv files.")
-            return render_template("index.html")
-
-        # Import here to use the new differentiation function
-        from calculator.tips import is_clock_file
+            return _render_index()
 
-        # Separate files by type
+        # Separate files by type. Each upload is parsed once here, in parallel threads
+        # (calamine and pyarrow release the GIL); the raw and header-applied frames
+        # are kept for the processing step below.
         clock_files = []
         tips_files = []
 
-        for f in valid_files:
+        with ThreadPoolExecutor(max_workers=min(8, len(valid_files))) as pool:
+            parsed = [pool.submit(_parse_upload, f) for f in valid_files]
+
+        for f, result in zip(valid_files, parsed):
             try:
-                file_bytes = f.read()
-                df = read_file_to_df(file_bytes, f.filename)
+                raw, df, cols_lower = result.result()
                 
-                if is_clock_file(df, f.filename):
-                    clock_files.append((f.filename, file_bytes))
-                    logger.info(f"Identified {f.filename} as clock/timesheet file")
+                if is_clock_file(df, f.filename, cols_lower):
+                    clock_files.append((f.filename, raw, df, cols_lower))
+                    logger.info("Identified %s as clock/timesheet file", f.filename)
                 else:
-                    tips_files.append((f.filename, file_bytes))
-                    logger.info(f"Identified {f.filename} as tips/sales file")
+                    tips_files.append((f.filename, raw, df, cols_lower))
+                    logger.info("Identified %s as tips/sales file", f.filename)
             except Exception as e:
-                logger.error(f"Could not identify file type for {f.filename}: {e}")
+                logger.error("Could not identify file type for %s: %s", f.filename, e)
                 flash(f"Error reading file {f.filename}: {e}")
-                return render_template("index.html")
+                return _render_index()
 
         if not clock_files:
             flash("No clock/timesheet file detected. Please ensure one of your files contains employee, date, and hours columns.")
-            return render_template("index.html")
+            return _render_index()
 
         # Always auto-detect columns (pass None to detection functions)
         date_col = None
@@ -282,25 +350,22 @@ def index():
         clock_hours_col = None
 
         try:
-            import pandas as pd
-
             # Load clock file (use first clock file if multiple identified)
-            clock_bytes = clock_files[0][1]
-            clock_df = read_file_to_df(clock_bytes, clock_files[0][0])
-            logger.info(f"Clock file {clock_files[0][0]} loaded successfully")
+            clock_df = clock_files[0][2]
+            logger.info("Clock file %s loaded successfully", clock_files[0][0])
 
             # Load tips/sales files if any
             dfs = []
-            for filename, file_bytes in tips_files:
+            for filename, raw, header_df, _ in tips_files:
                 # Try transposed sales report format first
-                df = _extract_from_transposed_sales_report(file_bytes, filename)
+                df = _extract_from_transposed_sales_report(raw)
                 
                 # If not a transposed report, try regular format
                 if df is None:
-                    df = read_file_to_df(file_bytes, filename)
+                    df = header_df
                 
                 dfs.append(df)
-                logger.info(f"Tips file {filename} loaded successfully")
+                logger.info("Tips file %s loaded successfully", filename)
 
             # Pass list of DataFrames to processor with clock data as primary
             final_dict, export_df = distribute_daily_tips_df(
@@ -313,37 +378,27 @@ def index():
                 clock_employee_col=clock_employee_col,
                 clock_date_col=clock_date_col,
                 clock_hours_col=clock_hours_col,
+                clock_cols_lower=clock_files[0][3],
             )
 
-            # Generate PDF report (pass first tips df for date range if available)
-            tips_for_date_range = dfs[0] if dfs else None
-            pdf_buffer = _generate_pdf_report(export_df, tips_for_date_range)
+            # Generate PDF report (dates from the first tips df give the period)
+            period = _report_period(dfs[0] if dfs else None)
+            pdf_buffer = _generate_pdf_report(export_df, period)
 
             # Generate filename with date range
             filename = "Tip_Summary.pdf"
-            if tips_for_date_range is not None and 'Date' in tips_for_date_range.columns:
-                try:
-                    import pandas as pd
-                    dates = pd.to_datetime(tips_for_date_range['Date'], errors='coerce').dropna()
-                    if len(dates) > 0:
-                        last_date = dates.max().strftime('%m-%d-%Y')
-                        filename = f"Tip_Summary_{last_date}.pdf"
-                except Exception:
-                    pass  # Fallback to default filename
-
-            return send_file(
-                pdf_buffer,
-                as_attachment=True,
-                download_name=filename,
-                mimetype="application/pdf",
-            )
+            if period is not None:
+                last_date = period[1].strftime('%m-%d-%Y')
+                filename = f"Tip_Summary_{last_date}.pdf"
+
+            return _pdf_response(pdf_buffer, filename)
         except Exception as e:
             # Capture exception in Sentry (if configured)
             if sentry_sdk is not None:
                 sentry_sdk.capture_exception(e)
             flash(f"Error processing file: {e}")
 
-    return render_template("index.html")
+    return _render_index()
 
 
 if __name__ == "__main__":